@@ -0,0 +1,327 @@
+"""
+Benchmarks for the preprocess, train and score hot paths.
+
+Usage (from the repository root):
+    python -m benchmarks.run_benchmarks run --sizes 1k,100k,1M --output benchmarks/baselines/main.json
+    python -m benchmarks.run_benchmarks compare benchmarks/baselines/main.json current.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import sklearn
+import yaml
+
+from utilities.metrics import binary_classification_metrics, bootstrap_metrics
+from utilities.ml_processes import build_preprocessor, run_preprocessing_df
+from utilities.model_factory import build_pipelines
+from utilities.synthetic_data import generate_synthetic_frame, load_profile
+
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+# Synthetic-data profile (utilities/synthetic_data.py) of the curated German Credit CSV
+GERMAN_CREDIT_PROFILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "german_credit_profile.json")
+
+
+def generate_german_credit(n_rows: int, random_state: int = 0, profile_path: str = GERMAN_CREDIT_PROFILE):
+    """
+    German-credit-shaped dataset of any size, drawn from the bundled profile.
+
+    Args:
+        n_rows (int): number of rows.
+        random_state (int): seed.
+        profile_path (str): fit_synthetic_profile() output to draw from.
+
+    Returns:
+        pd.DataFrame with the curated CSV's 20 features and CreditRisk.
+    """
+    return generate_synthetic_frame(load_profile(profile_path), n_rows, seed=random_state)
+
+
+def parse_size(size: str) -> int:
+    """
+    Parse a row count such as "1k", "100k", "1M", "10M" or "2500".
+    """
+    size = size.strip().lower()
+    if size[-1] in _SUFFIXES:
+        return int(float(size[:-1]) * _SUFFIXES[size[-1]])
+    return int(size)
+
+
+def measure(fn, repeats: int = 3) -> tuple[object, dict]:
+    """
+    Time fn() over several repeats, then measure its peak memory in one traced call.
+
+    With more than one repeat, an untimed warm-up call runs first so lazy
+    imports and allocator growth do not land in the first timing.
+
+    Timing runs are untraced (tracemalloc slows allocation-heavy code); the
+    traced run reports the peak of memory allocated during the call on top
+    of what was live before it. Native buffers allocated outside Python's
+    allocator (e.g. XGBoost's DMatrix) are not traced, so the process's
+    peak RSS so far is reported alongside as an upper bound.
+
+    Returns:
+        (result of the last call,
+         {"wall_s", "wall_s_min", "cpu_s", "repeats", "peak_mb", "max_rss_mb"}).
+    """
+    walls, cpus = [], []
+    result = fn() if repeats > 1 else None
+    for _ in range(repeats):
+        gc.collect()
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = fn()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+
+    del result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        "wall_s": float(np.median(walls)),
+        "wall_s_min": float(np.min(walls)),
+        "cpu_s": float(np.median(cpus)),
+        "repeats": repeats,
+        "peak_mb": (peak - before) / 1e6,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3,  # KiB on Linux
+    }
+
+
+def run_suite(
+    sizes: list,
+    feature_groups: dict,
+    candidates: list,
+    repeats: int = 3,
+    threshold: float = 0.5,
+    random_state: int = 0,
+    bootstrap_resamples: int = 200
+) -> list:
+    """
+    Benchmark every hot path at every dataset size.
+
+    Benchmarks (in pipeline order):
+        preprocess            run_preprocessing_df (dedupe + stratified split)
+        preprocessor_fit      build_preprocessor().fit on the train split
+        preprocessor_transform  fitted preprocessor on the train split
+        fit_<model>           each build_pipelines() candidate's fit
+        predict_<model>       its predict_proba on the test split
+        metrics               binary_classification_metrics (score_on_test metric set)
+        bootstrap             bootstrap_metrics of all candidates on the test split,
+                              paired, in-process; also reports resamples_per_s
+
+    Sizes above 100k rows run each benchmark once regardless of repeats.
+
+    Returns:
+        list[dict] with benchmark, rows and the measure() fields.
+    """
+    results = []
+
+    def record(name, n_rows, stats, note=""):
+        row = {"benchmark": name, "rows": n_rows, **stats}
+        results.append(row)
+        print(f"{name:<26}{n_rows:>12,}{stats['wall_s']:>10.3f}s{stats['peak_mb']:>10.1f} MB{note}", flush=True)
+
+    for n_rows in sizes:
+        df = generate_german_credit(n_rows, random_state=random_state)
+        reps = repeats if n_rows <= 100_000 else 1
+
+        (train_df, test_df), stats = measure(lambda: run_preprocessing_df(
+            df, drop_duplicates=True, test_size=0.2, random_state=random_state, stratify_col="CreditRisk"
+        ), reps)
+        record("preprocess", n_rows, stats)
+
+        X_train, y_train = train_df.drop(columns=["CreditRisk"]), train_df["CreditRisk"]
+        X_test, y_test = test_df.drop(columns=["CreditRisk"]), test_df["CreditRisk"]
+
+        preprocessor, stats = measure(lambda: build_preprocessor(feature_groups).fit(X_train, y_train), reps)
+        record("preprocessor_fit", n_rows, stats)
+        _, stats = measure(lambda: preprocessor.transform(X_train), reps)
+        record("preprocessor_transform", n_rows, stats)
+
+        test_proba = []
+        for cand in candidates:
+            name = cand["model"]
+
+            def fit():
+                return build_pipelines([cand], build_preprocessor(feature_groups))[name].fit(X_train, y_train)
+
+            pipeline, stats = measure(fit, reps)
+            record(f"fit_{name}", n_rows, stats)
+            y_proba, stats = measure(lambda: pipeline.predict_proba(X_test)[:, 1], reps)
+            record(f"predict_{name}", n_rows, stats)
+            test_proba.append(y_proba)
+
+        _, stats = measure(lambda: binary_classification_metrics(y_test, y_proba, threshold=threshold), reps)
+        record("metrics", n_rows, stats)
+
+        if bootstrap_resamples:
+            _, stats = measure(lambda: bootstrap_metrics(
+                y_test, np.vstack(test_proba), threshold=threshold,
+                n_resamples=bootstrap_resamples, random_state=random_state
+            ), reps)
+            stats["resamples_per_s"] = bootstrap_resamples / stats["wall_s"] if stats["wall_s"] > 0 else np.inf
+            record("bootstrap", n_rows, stats,
+                   f"{stats['resamples_per_s']:>10.1f} resamples/s ({len(y_test):,} rows x {len(test_proba)} candidates)")
+
+        del df, train_df, test_df, X_train, X_test
+        gc.collect()
+
+    return results
+
+
+def scaling_exponents(results: list) -> dict:
+    """
+    Log-log slope of wall time versus rows per benchmark (1.0 = linear scaling).
+    """
+    exponents = {}
+    for name in dict.fromkeys(r["benchmark"] for r in results):
+        points = [(r["rows"], r["wall_s"]) for r in results if r["benchmark"] == name and r["wall_s"] > 0]
+        if len({rows for rows, _ in points}) >= 2:
+            rows, walls = np.log(np.asarray(points, dtype=float)).T
+            exponents[name] = float(np.polyfit(rows, walls, 1)[0])
+    return exponents
+
+
+def environment_info() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare_results(
+    baseline: list,
+    current: list,
+    time_tolerance: float = 0.2,
+    memory_tolerance: float = 0.2,
+    min_seconds: float = 0.05
+) -> list:
+    """
+    Match benchmarks by (benchmark, rows) and flag slowdowns or memory growth.
+
+    Time is compared on the fastest repeat (wall_s_min), the least noisy
+    estimate. Benchmarks faster than min_seconds in the baseline are not
+    flagged on time, since timer noise dominates at that scale.
+
+    Returns:
+        list[dict] with benchmark, rows, time_ratio, memory_ratio and regression.
+    """
+    reference = {(r["benchmark"], r["rows"]): r for r in baseline}
+    rows = []
+    for r in current:
+        base = reference.get((r["benchmark"], r["rows"]))
+        if base is None:
+            continue
+        time_ratio = r["wall_s_min"] / base["wall_s_min"] if base["wall_s_min"] > 0 else np.nan
+        memory_ratio = r["peak_mb"] / base["peak_mb"] if base["peak_mb"] > 0 else np.nan
+        slower = base["wall_s_min"] >= min_seconds and time_ratio > 1 + time_tolerance
+        bigger = memory_ratio > 1 + memory_tolerance
+        rows.append({
+            "benchmark": r["benchmark"],
+            "rows": r["rows"],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regression": bool(slower or bigger),
+        })
+    return rows
+
+
+def _run(args):
+    with open(args.feature_groups, "r") as f:
+        feature_groups = yaml.safe_load(f)
+    with open(args.training_config, "r") as f:
+        training_config = yaml.safe_load(f)
+    candidates = training_config["candidates"]
+    if args.candidates:
+        keep = args.candidates.split(",")
+        candidates = [c for c in candidates if c["model"] in keep]
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")]
+    results = run_suite(
+        sizes, feature_groups, candidates,
+        repeats=args.repeats,
+        threshold=training_config["global_hyperparams"]["decision_threshold"],
+        bootstrap_resamples=args.bootstrap_resamples,
+    )
+    report = {"environment": environment_info(), "results": results, "scaling": scaling_exponents(results)}
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Scaling exponents: {json.dumps(report['scaling'], indent=2)}")
+    print(f"Saved results to {args.output}")
+
+
+def _compare(args):
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    with open(args.current, "r") as f:
+        current = json.load(f)
+
+    rows = compare_results(baseline["results"], current["results"], args.time_tolerance, args.memory_tolerance)
+    print(f"{'benchmark':<26}{'rows':>12}{'time x':>10}{'memory x':>10}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['benchmark']:<26}{row['rows']:>12,}{row['time_ratio']:>10.2f}{row['memory_ratio']:>10.2f}{flag}")
+
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmarks and save a JSON baseline")
+    run.add_argument("--sizes", type=str, default="1k,100k,1M", help="Comma-separated row counts (e.g. 1k,100k,1M,10M)")
+    run.add_argument("--repeats", type=int, default=3, help="Timed repeats per benchmark (sizes <= 100k)")
+    run.add_argument("--candidates", type=str, default=None, help="Comma-separated subset of candidate models")
+    run.add_argument("--bootstrap_resamples", type=int, default=200, help="Resamples of the bootstrap benchmark (0 = skip)")
+    run.add_argument("--feature_groups", type=str, default="./configs/feature_groups.yaml")
+    run.add_argument("--training_config", type=str, default="./configs/training_config.yaml")
+    run.add_argument("--output", type=str, default="./benchmarks/baselines/latest.json")
+
+    compare = sub.add_parser("compare", help="Compare two result files and flag regressions (exit code 1)")
+    compare.add_argument("baseline", type=str)
+    compare.add_argument("current", type=str)
+    compare.add_argument("--time_tolerance", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    compare.add_argument("--memory_tolerance", type=float, default=0.2, help="Allowed relative peak-memory growth")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        _run(args)
+    else:
+        _compare(args)
+
+
+if __name__ == "__main__":
+    main()
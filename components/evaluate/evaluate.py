@@ -2,7 +2,11 @@ import argparse
 import json
 import pandas as pd
 from utilities.ml_processes import select_best_model
-from utilities.mlflow_processes import get_candidates_for_current_run, score_on_test
+from utilities.instrumentation import TRACER, span
+from utilities.metrics import bootstrap_metrics, bootstrap_summary, threshold_curve
+from utilities.mlflow_processes import (
+    get_candidates_for_current_run, load_candidates_manifest, score_on_test, score_candidates_on_test
+)
 
 
 def main():
@@ -11,14 +15,32 @@ def main():
     parser.add_argument("--selection_criteria", type=str, required=True, help="JSON with selection criteria")
     parser.add_argument("--metrics_output", type=str, required=True)
     parser.add_argument("--best_model_pointer_file", type=str, required=True)
-    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--threshold", type=float, required=True, help="Decision threshold (training_config.yaml decision_threshold)")
+    parser.add_argument("--candidates_manifest", type=str, default=None,
+                        help="JSON manifest of registered candidates from the train step")
+    parser.add_argument("--step_key", type=str, default=None,
+                        help="Content hash of this step's inputs, config and code (for step reuse)")
+    parser.add_argument("--score_all_candidates", type=str, default="false",
+                        help="Score every candidate on the test set in parallel ('true'/'false')")
+    parser.add_argument("--candidates_metrics_output", type=str, default=None,
+                        help="Path to save the combined per-candidate test metrics (CSV)")
+    parser.add_argument("--bootstrap_resamples", type=int, default=0,
+                        help="Bootstrap resamples for confidence intervals (0 disables; turns on score_all_candidates)")
+    parser.add_argument("--bootstrap_output", type=str, default=None,
+                        help="Path to save bootstrap intervals and paired-difference tests (JSON)")
+    parser.add_argument("--threshold_curve_output", type=str, default=None,
+                        help="Path to save the champion's test-set threshold curve (CSV)")
     args = parser.parse_args()
 
     # Load data
-    test_df = pd.read_csv(args.test_data)
+    with span("csv_parse"):
+        test_df = pd.read_csv(args.test_data)
 
     # Parse configs
-    candidates = get_candidates_for_current_run()
+    if args.candidates_manifest:
+        candidates = load_candidates_manifest(args.candidates_manifest)
+    else:
+        candidates = get_candidates_for_current_run()
     selection_criteria = json.loads(args.selection_criteria)
 
     # Step 1: select champion
@@ -26,7 +48,57 @@ def main():
     model_uri = best["model_uri"]
 
     # Step 2: score on test set
-    metrics = score_on_test(model_uri, test_df, threshold=args.threshold)
+    # Declared outputs are always written; placeholders when the feature is off
+    summary = {"alpha": None, "reference": best["name"], "resamples": 0, "intervals": {}, "paired_differences": {}}
+    score_all_candidates = args.score_all_candidates.lower() == "true"
+    if args.bootstrap_resamples > 0 and not score_all_candidates:
+        # Bootstrap compares candidates on their test scores, so every candidate must be scored
+        print("bootstrap_resamples > 0: scoring every candidate on the test set")
+        score_all_candidates = True
+    if score_all_candidates:
+        # Champion/challenger table on held-out data; champion metrics come from it
+        table, y_proba = score_candidates_on_test(
+            candidates, test_df, threshold=args.threshold, return_proba=True
+        )
+        table["champion"] = table["model_uri"] == model_uri
+
+        if args.bootstrap_resamples > 0:
+            with span("bootstrap", resamples=args.bootstrap_resamples):
+                samples = bootstrap_metrics(
+                    test_df["CreditRisk"], y_proba,
+                    threshold=args.threshold,
+                    n_resamples=args.bootstrap_resamples,
+                    n_jobs=-1
+                )
+            summary = bootstrap_summary(
+                samples, table["name"].tolist(), reference=int(table["champion"].to_numpy().argmax())
+            )
+            summary["resamples"] = args.bootstrap_resamples
+        print(table.to_string(index=False))
+
+        champion_row = table.loc[table["champion"]].iloc[0]
+        metrics = {k: float(champion_row[k]) for k in table.columns
+                   if k not in ("name", "version", "model_uri", "champion")}
+        champion_proba = y_proba[int(table["champion"].to_numpy().argmax())]
+    else:
+        metrics, champion_proba = score_on_test(
+            model_uri, test_df, threshold=args.threshold, return_proba=True
+        )
+        # Champion-only table in the same layout
+        table = pd.DataFrame([{
+            "name": best["name"], "version": best.get("version"), "model_uri": model_uri, **metrics, "champion": True
+        }])
+
+    if args.candidates_metrics_output:
+        table.to_csv(args.candidates_metrics_output, index=False)
+    if args.bootstrap_output:
+        with open(args.bootstrap_output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    if args.threshold_curve_output:
+        with span("threshold_curve"):
+            curve = threshold_curve(test_df["CreditRisk"], champion_proba)
+        curve.to_csv(args.threshold_curve_output, index=False, float_format="%.6g")
 
     # Step 3: write outputs
     with open(args.metrics_output, "w") as f:
@@ -35,8 +107,9 @@ def main():
     with open(args.best_model_pointer_file, "w") as f:
         f.write(model_uri)
 
-    print(f" Best model: {best['model']} @ {model_uri}")
+    print(f" Best model: {best['name']} @ {model_uri}")
     print(f" Test metrics: {metrics}")
+    TRACER.export("evaluate")
 
 
 if __name__ == "__main__":
@@ -2,8 +2,11 @@
 # Not implemented yet, but this component will handle data ingestion from meaningful Azure sources.
 import argparse
 import os
+from io import BytesIO
+import pandas as pd
 from dotenv import load_dotenv
-from utilities.azure_storage import download_csv_from_blob
+from utilities.azure_storage import download_bytes_from_blob
+from utilities.instrumentation import TRACER, span
 
 
 def main():
@@ -18,12 +21,17 @@ def main():
 
     args = parser.parse_args()
 
-    # Download CSV from Azure Blob Storage
-    df = download_csv_from_blob(args.blob_name, conn_str, container_name)
+    # Download CSV from Azure Blob Storage (timed apart from parsing)
+    with span("blob_download", blob=args.blob_name):
+        content = download_bytes_from_blob(args.blob_name, conn_str, container_name)
+    with span("csv_parse", bytes=len(content)):
+        df = pd.read_csv(BytesIO(content))
 
     # Save the DataFrame to the specified output path
-    df.to_csv(args.output_csv, index=False)
+    with span("csv_write", rows=len(df)):
+        df.to_csv(args.output_csv, index=False)
     print(f"Downloaded CSV from blob '{args.blob_name}' and saved to '{args.output_csv}'.")
+    TRACER.export("ingest")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import argparse
+
+from utilities.mlflow_processes import load_candidates_manifest, write_candidates_manifest
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--manifest_a", type=str, required=True, help="Candidates manifest (JSON) of a train or merge step")
+    parser.add_argument("--manifest_b", type=str, default=None, help="Second candidates manifest (JSON) to combine")
+    parser.add_argument("--candidates_manifest", type=str, required=True, help="Path to save the combined manifest (JSON)")
+    args = parser.parse_args()
+
+    candidates = load_candidates_manifest(args.manifest_a)
+    if args.manifest_b:
+        candidates += load_candidates_manifest(args.manifest_b)
+
+    write_candidates_manifest(candidates, args.candidates_manifest)
+    print(f"Merged {len(candidates)} candidates: {[c['name'] for c in candidates]}")
+
+
+if __name__ == "__main__":
+    main()
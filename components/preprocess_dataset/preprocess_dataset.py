@@ -1,7 +1,9 @@
 import argparse
 import pandas as pd
 import json
-from utilities.ml_processes import run_preprocessing_df
+from utilities.ml_processes import clean_dataframe, split_dataframe
+from utilities.data_validation import build_data_contract, validate_dataframe
+from utilities.instrumentation import TRACER, span
 
 
 def main():
@@ -15,33 +17,59 @@ def main():
     parser.add_argument("--dtype_map", type=str, default=None, help="Column dtype map (JSON string)")
     parser.add_argument("--test_size", type=float, default=0.2, help="Proportion of test split")
     parser.add_argument("--random_state", type=int, default=42, help="Seed for reproducibility")
-    parser.add_argument("--stratify_col", type=str, default="target", help="Column name to stratify on (default 'target')")
+    parser.add_argument("--stratify_col", type=str, default="CreditRisk", help="Column name to stratify on (default 'CreditRisk')")
+    parser.add_argument("--feature_groups", type=str, default=None, help="JSON string with feature group definitions (enables data contract validation)")
+    parser.add_argument("--data_contract", type=str, default=None, help="JSON string with data contract settings (ranges, null rates, target)")
 
+    parser.add_argument("--step_key", type=str, default=None, help="Content hash of this step's inputs, config and code (for step reuse)")
     args = parser.parse_args()
 
+    if args.step_key:
+        print(f"Step key: {args.step_key}")
+
     # Load dataset
-    df = pd.read_csv(args.input_data)
+    with span("csv_parse"):
+        df = pd.read_csv(args.input_data)
 
     # Parse optional args
     dropna_cols = args.dropna_cols.split(",") if args.dropna_cols else None
     rename_map = json.loads(args.rename_map) if args.rename_map else None
     dtype_map = json.loads(args.dtype_map) if args.dtype_map else None
 
-    # Call reusable preprocessing function (returns train/test DFs)
-    train_df, test_df = run_preprocessing_df(
-        df=df,
-        dropna_cols=dropna_cols,
-        drop_duplicates=args.drop_duplicates,
-        rename_map=rename_map,
-        dtype_map=dtype_map,
-        test_size=args.test_size,
-        random_state=args.random_state,
-        stratify_col=args.stratify_col
-    )
+    with span("clean", rows=len(df)):
+        df = clean_dataframe(
+            df=df,
+            dropna_cols=dropna_cols,
+            drop_duplicates=args.drop_duplicates,
+            rename_map=rename_map,
+            dtype_map=dtype_map
+        )
+
+    # Fail fast on schema problems before splitting, on the rows the model will see
+    if args.feature_groups:
+        contract = build_data_contract(
+            json.loads(args.feature_groups),
+            json.loads(args.data_contract) if args.data_contract else None
+        )
+        with span("validate"):
+            report = validate_dataframe(df, contract, stratify_col=args.stratify_col)
+        for warning in report["warnings"]:
+            print(f"Data contract warning: {warning}")
+
+    with span("split", rows=len(df)):
+        train_df, test_df = split_dataframe(
+            df=df,
+            test_size=args.test_size,
+            random_state=args.random_state,
+            stratify_col=args.stratify_col
+        )
 
     # Save results
-    train_df.to_csv(args.train_output, index=False)
-    test_df.to_csv(args.test_output, index=False)
+    with span("csv_write"):
+        train_df.to_csv(args.train_output, index=False)
+        test_df.to_csv(args.test_output, index=False)
+
+    TRACER.export("preprocess")
 
 
 if __name__ == "__main__":
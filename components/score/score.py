@@ -0,0 +1,52 @@
+import argparse
+import mlflow
+from utilities.mlflow_processes import read_model_pointer, load_drift_reference
+from utilities.batch_scoring import score_csv_in_chunks
+from utilities.instrumentation import TRACER, span
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--best_model_pointer_file", type=str, required=True, help="Text file containing URI of the champion model")
+    parser.add_argument("--input_data", type=str, required=True, help="Path to unlabeled input dataset (CSV)")
+    parser.add_argument("--scores_output", type=str, required=True, help="Path to save scores (CSV)")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Rows per streamed chunk")
+    parser.add_argument("--n_workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--id_col", type=str, default=None, help="Column holding a stable row id; must exist in the input (default: row position)")
+    parser.add_argument("--threshold", type=float, default=None, help="Decision threshold; adds a 0/1 decision column")
+    parser.add_argument("--n_reasons", type=int, default=0, help="Number of adverse-action reason codes per row (0 disables)")
+    parser.add_argument("--background_data", type=str, default=None, help="Reference dataset (CSV) for reason-code baselines, e.g. the training split")
+    parser.add_argument("--monitor_drift", type=str, default="false", help="Log feature/score PSI and KS vs the training reference to MLflow ('true'/'false')")
+    args = parser.parse_args()
+
+    model_uri = read_model_pointer(args.best_model_pointer_file)
+    monitor = None
+    if args.monitor_drift.lower() == "true":
+        with span("drift_reference_load"):
+            monitor = load_drift_reference(model_uri)
+
+    with span("score_csv"):
+        n_rows = score_csv_in_chunks(
+            model_uri=model_uri,
+            input_path=args.input_data,
+            output_path=args.scores_output,
+            chunksize=args.chunksize,
+            n_workers=args.n_workers,
+            id_col=args.id_col,
+            threshold=args.threshold,
+            n_reasons=args.n_reasons,
+            background_path=args.background_data,
+            drift_monitor=monitor,
+        )
+
+    with mlflow.start_run():
+        if monitor is not None:
+            report = monitor.log_to_mlflow()
+            print(report.to_string())
+        TRACER.export("score")
+
+    print(f"Scored {n_rows} rows with {model_uri} -> {args.scores_output}")
+
+
+if __name__ == "__main__":
+    main()
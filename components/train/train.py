@@ -4,7 +4,9 @@ import pandas as pd
 
 from utilities.ml_processes import build_preprocessor
 from utilities.model_factory import build_pipelines
-from utilities.mlflow_processes import train_and_register_model
+from utilities.mlflow_processes import train_and_register_model, write_candidates_manifest
+from utilities.data_validation import build_data_contract, validate_dataframe
+from utilities.instrumentation import TRACER, span
 
 
 def main():
@@ -14,39 +16,60 @@ def main():
     parser.add_argument("--feature_groups", type=str, required=True, help="JSON string with feature group definitions")
     parser.add_argument("--random_state", type=int, default=42, help="Random seed for reproducibility")
     parser.add_argument("--cv_folds", type=int, default=5, help="Number of cross-validation folds")
-    parser.add_argument("--threshold", type=float, default=0.5, help="Decision threshold for classification metrics")
+    parser.add_argument("--threshold", type=float, required=True, help="Decision threshold for classification metrics (training_config.yaml decision_threshold)")
+    parser.add_argument("--data_contract", type=str, default=None, help="JSON string with data contract settings (ranges, null rates, target)")
+    parser.add_argument("--candidates_manifest", type=str, default=None, help="Path to save the registered candidates (JSON)")
+    parser.add_argument("--step_key", type=str, default=None, help="Content hash of this step's inputs, config and code (for step reuse)")
     args = parser.parse_args()
 
-    # --- Load dataset ---
-    df = pd.read_csv(args.input_data)
-    X = df.drop(columns=["CreditRisk"])
-    y = df["CreditRisk"]
+    if args.step_key:
+        print(f"Step key: {args.step_key}")
 
     # --- Parse configs ---
     candidates = json.loads(args.candidates)      # list of {model, params, tags, cv_score, ...}
     feature_groups = json.loads(args.feature_groups)
 
+    # --- Load and validate dataset before any fitting ---
+    with span("csv_parse"):
+        df = pd.read_csv(args.input_data)
+    contract = build_data_contract(feature_groups, json.loads(args.data_contract) if args.data_contract else None)
+    with span("validate"):
+        validate_dataframe(df, contract)
+
+    X = df.drop(columns=["CreditRisk"])
+    y = df["CreditRisk"]
+
     # --- Build preprocessor + pipelines ---
     preprocessor = build_preprocessor(feature_groups)
     pipelines = build_pipelines(candidates, preprocessor)
 
     # --- Train, log, and register each candidate ---
+    registered = []
     for cand in candidates:
         name = cand["model"]
         pipeline = pipelines[name]
 
-        metrics = train_and_register_model(
-            name=name,
-            pipeline=pipeline,
-            X_train=X,
-            y_train=y,
-            params=cand.get("params", {}),
-            tags=cand.get("tags", {}),
-            cv_folds=args.cv_folds,
-            threshold=args.threshold
-        )
-
-        print(f"Finished training {name}. Logged metrics: {metrics}")
+        with span(f"train_{name}"):
+            entry = train_and_register_model(
+                name=name,
+                pipeline=pipeline,
+                X_train=X,
+                y_train=y,
+                params=cand.get("params", {}),
+                tags=cand.get("tags", {}),
+                cv_folds=args.cv_folds,
+                threshold=args.threshold,
+                feature_groups=feature_groups
+            )
+
+        registered.append(entry)
+        print(f"Finished training {name}. Logged metrics: {entry['metrics']}")
+
+    if args.candidates_manifest:
+        write_candidates_manifest(registered, args.candidates_manifest)
+
+    # Fan-out steps get a one-candidate list; name their trace after it
+    TRACER.export(f"train_{candidates[0]['model']}" if len(candidates) == 1 else "train")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,50 @@
+import argparse
+
+import pandas as pd
+
+from utilities.synthetic_data import fit_synthetic_profile, generate_synthetic_data, load_profile, save_profile
+
+
+def main():
+    """
+    Generate synthetic applicants shaped like the curated German Credit CSV.
+
+    Example:
+        python generate_synthetic_data.py --source german_credit.csv --n_rows 10000000 \\
+            --output synthetic_credit.parquet --save_profile synthetic_profile.json
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--source", type=str, default=None, help="Curated CSV to fit the profile on")
+    parser.add_argument("--profile", type=str, default=None, help="Previously saved profile (JSON) instead of --source")
+    parser.add_argument("--save_profile", type=str, default=None, help="Where to save the fitted profile (JSON)")
+    parser.add_argument("--target_col", type=str, default="CreditRisk")
+    parser.add_argument("--n_rows", type=int, required=True, help="Rows to generate")
+    parser.add_argument("--output", type=str, required=True, help="Destination .csv or .parquet file")
+    parser.add_argument("--chunk_size", type=int, default=250_000, help="Rows per chunk (and per seeded stream)")
+    parser.add_argument("--n_workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--random_state", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.profile:
+        profile = load_profile(args.profile)
+    elif args.source:
+        profile = fit_synthetic_profile(pd.read_csv(args.source), target_col=args.target_col)
+    else:
+        parser.error("pass --source or --profile")
+
+    if args.save_profile:
+        save_profile(profile, args.save_profile)
+
+    n_rows = generate_synthetic_data(
+        profile,
+        n_rows=args.n_rows,
+        output_path=args.output,
+        chunk_size=args.chunk_size,
+        n_workers=args.n_workers,
+        random_state=args.random_state,
+    )
+    print(f"Generated {n_rows} synthetic rows into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Run the credit scoring DAG of pipelines.py in a single local process.
+
+Steps exchange DataFrames in memory instead of CSV files, independent steps
+(one train step per candidate) run concurrently, models are logged to a local
+file-backed MLflow store, and every step's wall time is recorded.
+
+Usage (from the repository root):
+    python -m pipelines.local_runner --raw_data ./german_credit.csv
+    python -m pipelines.local_runner --local_store ./data --blob_name german_credit.csv --candidates xgb
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import mlflow
+import pandas as pd
+import yaml
+
+from utilities.data_validation import build_data_contract, validate_dataframe
+from utilities.instrumentation import TRACER, span
+from utilities.metrics import bootstrap_metrics, bootstrap_summary, threshold_curve
+from utilities.ml_processes import build_preprocessor, clean_dataframe, select_best_model, split_dataframe
+from utilities.mlflow_processes import (
+    score_candidates_on_test, score_on_test, train_and_register_model, write_candidates_manifest
+)
+from utilities.model_factory import build_pipelines
+
+
+@dataclass
+class LocalStep:
+    """
+    One node of the local DAG.
+
+    Args:
+        name (str): unique step name.
+        fn (callable): called with {dependency name: dependency output}.
+        deps (list[str]): names of the steps whose outputs fn consumes.
+    """
+    name: str
+    fn: callable
+    deps: list = field(default_factory=list)
+
+
+def _run_timed(step: LocalStep, inputs: dict, origin: float):
+    start = time.perf_counter()
+    with span(step.name):
+        output = step.fn(inputs)
+    end = time.perf_counter()
+    return output, {"start_s": start - origin, "end_s": end - origin, "wall_s": end - start}
+
+
+def run_dag(steps: list, max_workers: int = None) -> tuple[dict, dict]:
+    """
+    Execute steps in a thread pool as soon as all their dependencies have finished.
+
+    Args:
+        steps (list[LocalStep]): DAG nodes, in any order.
+        max_workers (int, optional): concurrent steps; defaults to the pool default.
+
+    Returns:
+        (outputs, timings): dicts keyed by step name; timings hold start_s and
+        end_s (relative to the DAG start) and wall_s per step.
+    """
+    names = {step.name for step in steps}
+    for step in steps:
+        unknown = [d for d in step.deps if d not in names]
+        if unknown:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps {unknown}")
+
+    pending = {step.name: step for step in steps}
+    outputs, timings, running = {}, {}, {}
+    origin = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            ready = [s for s in pending.values() if all(d in outputs for d in s.deps)]
+            for step in ready:
+                del pending[step.name]
+                inputs = {d: outputs[d] for d in step.deps}
+                running[pool.submit(_run_timed, step, inputs, origin)] = step.name
+            if not running:
+                raise ValueError(f"Dependency cycle between steps {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                outputs[name], timings[name] = future.result()
+
+    return outputs, timings
+
+
+def build_local_steps(
+    raw_data,
+    candidates: list,
+    feature_groups: dict,
+    preprocess_config: dict,
+    global_params: dict,
+    selection_criteria: dict,
+    data_contract: dict = None,
+    score_all_candidates: bool = False,
+    bootstrap_resamples: int = 0
+) -> list:
+    """
+    Build the ingest -> preprocess -> train (one step per candidate) -> evaluate DAG.
+
+    Args:
+        raw_data (pd.DataFrame | str): raw dataset, or a CSV path in a local store.
+        candidates (list): training_config.yaml candidates.
+        feature_groups (dict): feature_groups.yaml content.
+        preprocess_config (dict): preprocess_config.yaml content.
+        global_params (dict): training_config.yaml global_hyperparams.
+        selection_criteria (dict): training_config.yaml selection_criteria.
+        data_contract (dict, optional): data_contract.yaml content.
+        score_all_candidates (bool): score every candidate on the test set.
+        bootstrap_resamples (int): bootstrap resamples; > 0 implies score_all_candidates.
+
+    Returns:
+        list[LocalStep]
+    """
+    split_cfg = preprocess_config["split"]
+    clean_cfg = preprocess_config["cleaning"]
+    threshold = global_params["decision_threshold"]
+    contract = build_data_contract(feature_groups, data_contract)
+
+    def ingest(_):
+        if isinstance(raw_data, pd.DataFrame):
+            return raw_data
+        return pd.read_csv(raw_data)
+
+    def preprocess(inputs):
+        df = clean_dataframe(
+            df=inputs["ingest"],
+            dropna_cols=clean_cfg["dropna_cols"] or None,
+            drop_duplicates=clean_cfg["drop_duplicates"]
+        )
+        # Validate the cleaned rows the model sees; data stays in memory, so
+        # this one check covers the train step's validation too
+        validate_dataframe(df, contract, stratify_col=split_cfg["stratify_col"])
+        train_df, test_df = split_dataframe(
+            df=df,
+            test_size=split_cfg["test_size"],
+            random_state=split_cfg["random_state"],
+            stratify_col=split_cfg["stratify_col"]
+        )
+        return {"train": train_df, "test": test_df}
+
+    def make_train(cand):
+        def train(inputs):
+            train_df = inputs["preprocess"]["train"]
+            pipeline = build_pipelines([cand], build_preprocessor(feature_groups))[cand["model"]]
+            return train_and_register_model(
+                name=cand["model"],
+                pipeline=pipeline,
+                X_train=train_df.drop(columns=["CreditRisk"]),
+                y_train=train_df["CreditRisk"],
+                params=cand.get("params", {}),
+                tags=cand.get("tags", {}),
+                cv_folds=global_params.get("cv_folds", 5),
+                threshold=threshold,
+                feature_groups=feature_groups
+            )
+        return train
+
+    train_steps = [f"train_{cand['model']}" for cand in candidates]
+
+    def evaluate(inputs):
+        test_df = inputs["preprocess"]["test"]
+        registered = [inputs[name] for name in train_steps]
+        best = select_best_model(registered, selection_criteria)
+        result = {"best": best, "candidates": registered}
+
+        if score_all_candidates or bootstrap_resamples > 0:
+            table, y_proba = score_candidates_on_test(registered, test_df, threshold=threshold, return_proba=True)
+            table["champion"] = table["model_uri"] == best["model_uri"]
+            champion = int(table["champion"].to_numpy().argmax())
+            result["candidates_metrics"] = table
+            result["metrics"] = {k: float(table.iloc[champion][k]) for k in table.columns
+                                 if k not in ("name", "version", "model_uri", "champion")}
+            champion_proba = y_proba[champion]
+            if bootstrap_resamples > 0:
+                samples = bootstrap_metrics(
+                    test_df["CreditRisk"], y_proba, threshold=threshold, n_resamples=bootstrap_resamples, n_jobs=-1
+                )
+                result["bootstrap"] = bootstrap_summary(samples, table["name"].tolist(), reference=champion)
+        else:
+            result["metrics"], champion_proba = score_on_test(
+                best["model_uri"], test_df, threshold=threshold, return_proba=True
+            )
+
+        result["threshold_curve"] = threshold_curve(test_df["CreditRisk"], champion_proba)
+        return result
+
+    steps = [
+        LocalStep("ingest", ingest),
+        LocalStep("preprocess", preprocess, ["ingest"]),
+    ]
+    steps += [LocalStep(name, make_train(cand), ["preprocess"]) for name, cand in zip(train_steps, candidates)]
+    steps.append(LocalStep("evaluate", evaluate, ["preprocess"] + train_steps))
+    return steps
+
+
+def format_timings(timings: dict) -> str:
+    """
+    Render step timings as a table ordered by start time.
+    """
+    lines = [f"{'step':<20}{'start_s':>10}{'end_s':>10}{'wall_s':>10}"]
+    for name, t in sorted(timings.items(), key=lambda item: item[1]["start_s"]):
+        lines.append(f"{name:<20}{t['start_s']:>10.2f}{t['end_s']:>10.2f}{t['wall_s']:>10.2f}")
+    total = max((t["end_s"] for t in timings.values()), default=0.0)
+    lines.append(f"{'total':<20}{'':>10}{total:>10.2f}")
+    return "\n".join(lines)
+
+
+def write_local_outputs(result: dict, timings: dict, output_dir: str):
+    """
+    Write the evaluate step's outputs (same files as the Azure ML pipeline), the
+    timings and a Chrome trace of every stage span (trace.json).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "metrics.json"), "w") as f:
+        json.dump(result["metrics"], f, indent=2)
+    with open(os.path.join(output_dir, "best_model_pointer.txt"), "w") as f:
+        f.write(result["best"]["model_uri"])
+    write_candidates_manifest(result["candidates"], os.path.join(output_dir, "candidates_manifest.json"))
+    result["threshold_curve"].to_csv(os.path.join(output_dir, "threshold_curve.csv"), index=False, float_format="%.6g")
+    if "candidates_metrics" in result:
+        result["candidates_metrics"].to_csv(os.path.join(output_dir, "candidates_metrics.csv"), index=False)
+    if "bootstrap" in result:
+        with open(os.path.join(output_dir, "bootstrap_intervals.json"), "w") as f:
+            json.dump(result["bootstrap"], f, indent=2)
+    with open(os.path.join(output_dir, "timings.json"), "w") as f:
+        json.dump(timings, f, indent=2)
+    with open(os.path.join(output_dir, "trace.json"), "w") as f:
+        json.dump(TRACER.chrome_trace(process_name="local_pipeline"), f)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--raw_data", type=str, default=None, help="Path to the raw CSV")
+    parser.add_argument("--local_store", type=str, default=None, help="Local directory standing in for the blob container")
+    parser.add_argument("--blob_name", type=str, default=None, help="File to ingest from --local_store")
+    parser.add_argument("--configs_dir", type=str, default="./configs")
+    parser.add_argument("--candidates", type=str, default=None, help="Comma-separated subset of candidate models to train")
+    parser.add_argument("--output_dir", type=str, default="./.local_run")
+    parser.add_argument("--tracking_uri", type=str, default=None,
+                        help="MLflow tracking/registry URI (default: file store under --output_dir)")
+    parser.add_argument("--max_workers", type=int, default=None, help="Concurrent steps")
+    parser.add_argument("--score_all_candidates", action="store_true")
+    parser.add_argument("--bootstrap_resamples", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.local_store and args.blob_name:
+        raw_data = os.path.join(args.local_store, args.blob_name)
+    elif args.raw_data:
+        raw_data = args.raw_data
+    else:
+        parser.error("pass --raw_data or --local_store with --blob_name")
+
+    def _load(name):
+        with open(os.path.join(args.configs_dir, name), "r") as f:
+            return yaml.safe_load(f)
+
+    training_config = _load("training_config.yaml")
+    candidates = training_config["candidates"]
+    if args.candidates:
+        keep = args.candidates.split(",")
+        candidates = [c for c in candidates if c["model"] in keep]
+
+    tracking_uri = args.tracking_uri or "file:" + os.path.abspath(os.path.join(args.output_dir, "mlruns"))
+    mlflow.set_tracking_uri(tracking_uri)
+    mlflow.set_registry_uri(tracking_uri)
+    mlflow.set_experiment("credit_scoring_local")
+
+    steps = build_local_steps(
+        raw_data,
+        candidates=candidates,
+        feature_groups=_load("feature_groups.yaml"),
+        preprocess_config=_load("preprocess_config.yaml"),
+        global_params=training_config["global_hyperparams"],
+        selection_criteria=training_config["selection_criteria"],
+        data_contract=_load("data_contract.yaml"),
+        score_all_candidates=args.score_all_candidates,
+        bootstrap_resamples=args.bootstrap_resamples,
+    )
+    outputs, timings = run_dag(steps, max_workers=args.max_workers)
+    result = outputs["evaluate"]
+    write_local_outputs(result, timings, args.output_dir)
+
+    print(format_timings(timings))
+    print(TRACER.summary().head(15).to_string(float_format=lambda v: f"{v:.3f}"))
+    print(f" Best model: {result['best']['name']} @ {result['best']['model_uri']}")
+    print(f" Test metrics: {result['metrics']}")
+    print(f" MLflow store: {tracking_uri}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import json
+
 from azure.ai.ml import dsl, Input
 from azure.ai.ml import load_component
 
@@ -5,54 +7,129 @@ from azure.ai.ml import load_component
 preprocess_component = load_component(source="../components/preprocess_dataset/preprocess_dataset.yaml")
 train_component = load_component(source="../components/train/train.yaml")
 evaluate_component = load_component(source="../components/evaluate/evaluate.yaml")  # placeholder
+merge_manifests_component = load_component(source="../components/merge_manifests/merge_manifests.yaml")
 
 
-@dsl.pipeline(
-    description="Credit Scoring Pipeline"
-)
-def credit_scoring_pipeline(
-    raw_data_path: str,
-    candidates_json: str,
-    feature_groups_json: str,
-    selection_criteria_json: str,
-    dropna_cols: str = None,
-    drop_duplicates: bool = True,
-    test_size: float = 0.2,
-    random_state: int = 42,
-    stratify_col: str = "CreditRisk",
-    cv_folds: int = 5,
-    decision_threshold: float = 0.05,
-):
-    # Step 1: Preprocessing
-    preprocess_step = preprocess_component(
-        input_data=Input(type="uri_file", path=raw_data_path),
-        dropna_cols=dropna_cols,
-        drop_duplicates=drop_duplicates,
-        test_size=test_size,
-        random_state=random_state,
-        stratify_col=stratify_col,
-    )
+def _merge_manifests(manifests: list):
+    """
+    Fan-in the per-candidate manifests pairwise into a single manifest output.
 
-    # Step 2: Training
-    train_step = train_component(
-        input_data=preprocess_step.outputs.train_output,
-        candidates=candidates_json,
-        feature_groups=feature_groups_json,
-        random_state=random_state,
-        cv_folds=cv_folds,
-        threshold=decision_threshold,
-    )
+    Merges form a balanced tree, so each one starts as soon as its two inputs
+    finish and the fan-in adds only log2(n_candidates) short steps.
+    """
+    while len(manifests) > 1:
+        merged = []
+        for i in range(0, len(manifests), 2):
+            if i + 1 < len(manifests):
+                merge_step = merge_manifests_component(manifest_a=manifests[i], manifest_b=manifests[i + 1])
+                merged.append(merge_step.outputs.candidates_manifest)
+            else:
+                merged.append(manifests[i])
+        manifests = merged
+    return manifests[0]
+
+
+def build_credit_scoring_pipeline(candidates: list, train_step_keys: dict = None):
+    """
+    Build the credit scoring DSL pipeline with one train step per candidate.
+
+    The DSL graph is fixed when the pipeline is built, so the candidate list
+    is a Python-level argument rather than a pipeline input. Train steps are
+    independent and run concurrently (one node each, up to the cluster's
+    max instances), so training wall time is that of the slowest candidate.
+    Each step only receives its own candidate, so editing or adding one
+    candidate leaves the other train steps reusable.
 
-    # Step 3: Evaluation
-    evaluate_step = evaluate_component(
-        test_data=preprocess_step.outputs.test_output,
-        selection_criteria=selection_criteria_json,
-        threshold=decision_threshold,
+    Args:
+        candidates (list): training_config.yaml candidates. An optional
+            "compute" key runs that candidate on a different compute target.
+        train_step_keys (dict, optional): {model: step key} for the train
+            steps (see step_cache.compute_step_keys()).
+
+    Returns:
+        the @dsl.pipeline function to call with the remaining parameters.
+    """
+    if not candidates:
+        raise ValueError("build_credit_scoring_pipeline needs at least one candidate (training_config.yaml candidates is empty)")
+    train_step_keys = train_step_keys or {}
+
+    @dsl.pipeline(
+        description="Credit Scoring Pipeline"
     )
+    def credit_scoring_pipeline(
+        raw_data_path: str,
+        feature_groups_json: str,
+        selection_criteria_json: str,
+        decision_threshold: float,
+        dropna_cols: str = None,
+        drop_duplicates: bool = True,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        stratify_col: str = "CreditRisk",
+        cv_folds: int = 5,
+        score_all_candidates: bool = False,
+        bootstrap_resamples: int = 0,
+        data_contract_json: str = None,
+        preprocess_step_key: str = None,
+        evaluate_step_key: str = None,
+    ):
+        # Step 1: Preprocessing
+        preprocess_step = preprocess_component(
+            input_data=Input(type="uri_file", path=raw_data_path),
+            dropna_cols=dropna_cols,
+            drop_duplicates=drop_duplicates,
+            test_size=test_size,
+            random_state=random_state,
+            stratify_col=stratify_col,
+            feature_groups=feature_groups_json,
+            data_contract=data_contract_json,
+            step_key=preprocess_step_key,
+        )
+
+        # Step 2: Training, fanned out to one step per candidate
+        manifests = []
+        for cand in candidates:
+            name = cand["model"]
+            train_step = train_component(
+                input_data=preprocess_step.outputs.train_output,
+                # Only this candidate, so a change to another one leaves this step's inputs (and reuse) intact
+                candidates=json.dumps([cand]),
+                feature_groups=feature_groups_json,
+                random_state=random_state,
+                cv_folds=cv_folds,
+                threshold=decision_threshold,
+                data_contract=data_contract_json,
+                step_key=train_step_keys.get(name),
+            )
+            train_step.name = f"train_{name}"
+            train_step.display_name = f"Train {name}"
+            if cand.get("compute"):
+                train_step.compute = cand["compute"]
+            manifests.append(train_step.outputs.candidates_manifest)
+
+        # Evaluate depends on every train step through the merged manifest
+        candidates_manifest = _merge_manifests(manifests)
+
+        # Step 3: Evaluation
+        evaluate_step = evaluate_component(
+            test_data=preprocess_step.outputs.test_output,
+            candidates_manifest=candidates_manifest,
+            step_key=evaluate_step_key,
+            selection_criteria=selection_criteria_json,
+            threshold=decision_threshold,
+            score_all_candidates=score_all_candidates,
+            bootstrap_resamples=bootstrap_resamples,
+        )
+
+        return {
+            "candidates_manifest": candidates_manifest,
+            "train_data": preprocess_step.outputs.train_output,
+            "test_data": preprocess_step.outputs.test_output,
+            "metrics": evaluate_step.outputs.metrics_output,
+            "best_model_pointer_file": evaluate_step.outputs.best_model_pointer_file,
+            "candidates_metrics": evaluate_step.outputs.candidates_metrics_output,
+            "bootstrap_intervals": evaluate_step.outputs.bootstrap_output,
+            "threshold_curve": evaluate_step.outputs.threshold_curve_output,
+        }
 
-    return {
-        "train_data": preprocess_step.outputs.train_output,
-        "test_data": preprocess_step.outputs.test_output,
-        "metrics": evaluate_step.outputs.metrics_output,
-        "best_model_pointer_file": evaluate_step.outputs.best_model_pointer_file,
-    }
+    return credit_scoring_pipeline
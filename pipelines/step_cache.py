@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+
+
+# Source each step's code depends on (relative to the repo root). The whole
+# utilities package is hashed rather than a hand-picked file list, since its
+# modules import each other and a missed file would serve stale outputs.
+STEP_CODE = {
+    "preprocess": ["components/preprocess_dataset", "utilities"],
+    "train": ["components/train", "utilities"],
+    "evaluate": ["components/evaluate", "components/merge_manifests", "utilities"],
+}
+
+
+def hash_parts(*parts) -> str:
+    """
+    Stable SHA-256 of JSON-serialisable parts (dict keys are sorted).
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint_data(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Content fingerprint of a data input.
+
+    Local files are hashed by content. Remote URIs (azureml://, https://, ...)
+    cannot be read here, so their URI is used as the fingerprint; point
+    RAW_DATA_PATH at a versioned data asset so new data gets a new URI.
+    """
+    if path and os.path.isfile(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return f"sha256:{digest.hexdigest()}"
+    return f"uri:{path}"
+
+
+def code_version(paths: list, root: str = ".") -> str:
+    """
+    Hash of every .py/.yaml file under the given paths (files or directories).
+    """
+    digest = hashlib.sha256()
+    files = []
+    for rel in paths:
+        full = os.path.join(root, rel)
+        if os.path.isdir(full):
+            for dirpath, _, names in os.walk(full):
+                files.extend(os.path.join(dirpath, n) for n in names if n.endswith((".py", ".yaml", ".yml")))
+        elif os.path.isfile(full):
+            files.append(full)
+
+    for file in sorted(files):
+        digest.update(os.path.relpath(file, root).encode("utf-8"))
+        with open(file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def compute_step_keys(
+    raw_data_path: str,
+    preprocess_params: dict,
+    train_params: dict,
+    evaluate_params: dict,
+    root: str = "."
+) -> dict:
+    """
+    Content-hash key per pipeline step, chained along the DAG.
+
+    Each key covers the step's own config and code version plus the key of
+    the step it consumes, so a change only invalidates the steps downstream
+    of it: a selection-criteria change re-runs evaluate only, a candidate
+    change re-runs that candidate's train step and evaluate, new raw data
+    re-runs everything.
+
+    Args:
+        raw_data_path (str): raw input (local path or URI).
+        preprocess_params (dict): every parameter passed to the preprocess step.
+        train_params (dict): every parameter passed to the train steps; its
+            "candidates" list is split into one train step per candidate.
+        evaluate_params (dict): every parameter passed to the evaluate step.
+        root (str): repository root used to locate component code.
+
+    Returns:
+        dict {"preprocess": key, "train_<model>": key (per candidate), "evaluate": key}.
+    """
+    preprocess_key = hash_parts(
+        "preprocess", fingerprint_data(raw_data_path), preprocess_params, code_version(STEP_CODE["preprocess"], root)
+    )
+
+    shared = {k: v for k, v in train_params.items() if k != "candidates"}
+    train_code = code_version(STEP_CODE["train"], root)
+    train_keys = {
+        f"train_{cand['model']}": hash_parts("train", preprocess_key, shared, cand, train_code)
+        for cand in train_params.get("candidates", [])
+    }
+
+    evaluate_key = hash_parts(
+        "evaluate", preprocess_key, sorted(train_keys.items()), evaluate_params,
+        code_version(STEP_CODE["evaluate"], root)
+    )
+    return {"preprocess": preprocess_key, **train_keys, "evaluate": evaluate_key}
+
+
+def diff_step_keys(keys: dict, cache_file: str) -> dict:
+    """
+    Compare keys with the last successful submission recorded in cache_file.
+
+    Returns:
+        dict {step: "reuse" | "run"} for reporting which steps will execute.
+    """
+    previous = {}
+    if os.path.exists(cache_file):
+        with open(cache_file, "r") as f:
+            previous = json.load(f)
+    return {step: "reuse" if previous.get(step) == key else "run" for step, key in keys.items()}
+
+
+def save_step_keys(keys: dict, cache_file: str):
+    """
+    Record the keys of a submission; call only once the job was accepted,
+    so a failed submit is not reported as "reuse" next time.
+    """
+    os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+    with open(cache_file, "w") as f:
+        json.dump(keys, f, indent=2)
+
+
+def submit_and_record(submit, keys: dict, cache_file: str):
+    """
+    Call submit() and record keys only once it returns, so a submission that
+    raises leaves cache_file as it was and its steps still report "run".
+
+    Args:
+        submit (callable): performs the submission (e.g. ml_client.jobs.create_or_update).
+        keys (dict): compute_step_keys() output of this submission.
+        cache_file (str): JSON file of the last successful submission's keys.
+
+    Returns:
+        whatever submit() returns.
+    """
+    result = submit()
+    save_step_keys(keys, cache_file)
+    return result
@@ -5,7 +5,8 @@ from dotenv import load_dotenv
 from azure.ai.ml import MLClient, Input
 from azure.identity import DefaultAzureCredential
 
-from pipelines import credit_scoring_pipeline
+from pipelines import build_credit_scoring_pipeline
+from step_cache import compute_step_keys, diff_step_keys, submit_and_record
 
 # --- 1. Load environment variables ---
 load_dotenv()
@@ -15,6 +16,7 @@ RESOURCE_GROUP = os.getenv("RESOURCE_GROUP")
 WORKSPACE_NAME = os.getenv("WORKSPACE_NAME")
 COMPUTE_NAME = os.getenv("COMPUTE_NAME")
 RAW_DATA_PATH = os.getenv("RAW_DATA_PATH")
+FORCE_RERUN = os.getenv("FORCE_RERUN", "false").lower() == "true"
 
 # --- 2. Connect to Azure ML workspace ---
 ml_client = MLClient(
@@ -32,8 +34,7 @@ candidates = training_config["candidates"]
 global_params = training_config["global_hyperparams"]
 selection_criteria = training_config["selection_criteria"]
 
-# Serialize configs to JSON strings
-candidates_json = json.dumps(candidates)
+# Serialize configs to JSON strings (candidates fan out to one train step each)
 selection_criteria_json = json.dumps(selection_criteria)
 
 # --- 4. Load feature groups config ---
@@ -49,10 +50,47 @@ with open("./configs/preprocess_config.yaml", "r") as f:
 split_cfg = preprocess_config["split"]
 clean_cfg = preprocess_config["cleaning"]
 
-# --- 6. Build pipeline job ---
+# --- 6. Load data contract ---
+with open("./configs/data_contract.yaml", "r") as f:
+    data_contract = yaml.safe_load(f)
+
+data_contract_json = json.dumps(data_contract)
+
+# --- 7. Compute content-hash step keys ---
+# Azure ML reuses a deterministic step when its component and inputs are
+# unchanged; the keys fold data fingerprints, config and code version into
+# those inputs so only steps downstream of a real change execute.
+preprocess_params = {
+    "dropna_cols": clean_cfg["dropna_cols"],
+    "drop_duplicates": clean_cfg["drop_duplicates"],
+    "split": split_cfg,
+    "feature_groups": feature_groups,
+    "data_contract": data_contract,
+}
+train_params = {
+    "candidates": candidates,
+    "feature_groups": feature_groups,
+    "global_hyperparams": global_params,
+    "random_state": split_cfg["random_state"],
+    "data_contract": data_contract,
+}
+evaluate_params = {
+    "selection_criteria": selection_criteria,
+    "decision_threshold": global_params["decision_threshold"],
+}
+step_keys = compute_step_keys(RAW_DATA_PATH, preprocess_params, train_params, evaluate_params)
+
+STEP_KEYS_FILE = "./.pipeline_cache/step_keys.json"
+for step, status in diff_step_keys(step_keys, STEP_KEYS_FILE).items():
+    print(f"{step:<14} {step_keys[step][:12]}  {'forced' if FORCE_RERUN else status}")
+
+# --- 8. Build pipeline job ---
+credit_scoring_pipeline = build_credit_scoring_pipeline(
+    candidates,
+    train_step_keys={cand["model"]: step_keys[f"train_{cand['model']}"] for cand in candidates},
+)
 pipeline_job = credit_scoring_pipeline(
     raw_data_path=RAW_DATA_PATH,
-    candidates_json=candidates_json,
     feature_groups_json=feature_groups_json,
     selection_criteria_json=selection_criteria_json,  # NEW
     dropna_cols=",".join(clean_cfg["dropna_cols"]) if clean_cfg["dropna_cols"] else None,
@@ -61,16 +99,21 @@ pipeline_job = credit_scoring_pipeline(
     random_state=split_cfg["random_state"],
     stratify_col=split_cfg["stratify_col"],
     cv_folds=global_params.get("cv_folds"),
-    decision_threshold=global_params.get("decision_threshold"),
+    decision_threshold=global_params["decision_threshold"],
+    data_contract_json=data_contract_json,
+    preprocess_step_key=step_keys["preprocess"],
+    evaluate_step_key=step_keys["evaluate"],
 )
 
 # Attach compute target explicitly
 pipeline_job.settings.default_compute = COMPUTE_NAME
+pipeline_job.settings.force_rerun = FORCE_RERUN
 
-# --- 7. Submit the pipeline job ---
-submitted_job = ml_client.jobs.create_or_update(
-    pipeline_job,
-    experiment_name="credit_scoring_experiment",
+# --- 9. Submit the pipeline job (step keys are recorded only if it is accepted) ---
+submitted_job = submit_and_record(
+    lambda: ml_client.jobs.create_or_update(pipeline_job, experiment_name="credit_scoring_experiment"),
+    step_keys,
+    STEP_KEYS_FILE,
 )
 
 print(f"Pipeline submitted. Job name: {submitted_job.name}")
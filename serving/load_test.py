@@ -0,0 +1,96 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+
+async def _worker(host: str, port: int, payloads: list, n_requests: int, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n_requests):
+            body = payloads[i % len(payloads)]
+            request = (
+                f"POST /score HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode("latin-1") + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            content_length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    content_length = int(line.split(b":", 1)[1])
+            await reader.readexactly(content_length)
+            latencies.append(time.perf_counter() - start)
+
+            if b" 200 " not in status_line:
+                errors.append(status_line.decode("latin-1").strip())
+    finally:
+        writer.close()
+
+
+async def _get_json(host: str, port: int, path: str) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def run_load_test(host: str, port: int, records: list, concurrency: int, total_requests: int) -> dict:
+    """
+    Fire total_requests single-application requests over `concurrency`
+    keep-alive connections and report throughput and latency percentiles.
+    """
+    payloads = [json.dumps(r).encode("utf-8") for r in records]
+    per_worker = max(1, total_requests // concurrency)
+    latencies, errors = [], []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        _worker(host, port, payloads[i:] + payloads[:i], per_worker, latencies, errors)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "latency_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(latencies_ms.max())},
+        "server_metrics": await _get_json(host, port, "/metrics"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data_csv", type=str, required=True, help="CSV with application rows (label column is dropped)")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=64, help="Number of concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=10000, help="Total number of /score requests")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data_csv).drop(columns=["CreditRisk"], errors="ignore")
+    # Round-trip through JSON so numpy scalars become plain Python values
+    records = json.loads(df.to_json(orient="records"))
+
+    report = asyncio.run(run_load_test(args.host, args.port, records, args.concurrency, args.requests))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
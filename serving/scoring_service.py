@@ -0,0 +1,475 @@
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import deque
+
+import mlflow
+import numpy as np
+import pandas as pd
+import yaml
+
+from utilities.ml_processes import load_decision_threshold
+from utilities.mlflow_processes import read_model_pointer
+from utilities.score_cache import ScoreCache, feature_group_columns
+from utilities.tree_ensemble import export_tree_ensemble
+
+
+class ScoringModel:
+    """
+    Champion pipeline loaded once and scored on batches of application records.
+
+    Args:
+        model: fitted sklearn Pipeline (preprocessor + estimator).
+        model_uri (str): MLflow URI the model was loaded from.
+        compact_trees (bool): score tree ensembles through the compact
+            array-backed predictor (see utilities/tree_ensemble.py).
+    """
+
+    def __init__(self, model, model_uri: str, compact_trees: bool = False):
+        self.model = model
+        self.model_uri = model_uri
+        self.feature_columns = list(getattr(model, "feature_names_in_", []))
+        self.numeric_columns = _numeric_columns(model)
+        self._compact = None
+        if compact_trees:
+            try:
+                self._compact = export_tree_ensemble(model)
+            except ValueError as e:
+                print(f"Compact tree scoring disabled: {e}")
+
+    @classmethod
+    def from_pointer(cls, pointer_file: str, compact_trees: bool = False) -> "ScoringModel":
+        model_uri = read_model_pointer(pointer_file)
+        return cls(mlflow.sklearn.load_model(model_uri), model_uri, compact_trees=compact_trees)
+
+    def missing_columns(self, record: dict) -> list:
+        return [c for c in self.feature_columns if c not in record]
+
+    def coerce_record(self, record: dict) -> tuple[dict, list]:
+        """
+        Cast a record to the training schema: numeric columns to float (null
+        stays missing for the imputer), categorical values to str.
+
+        Returns:
+            (coerced record, list of error messages; empty when valid).
+        """
+        missing = self.missing_columns(record)
+        errors = [f"missing features: {missing}"] if missing else []
+        coerced = dict(record)
+        for column in self.feature_columns:
+            value = record.get(column)
+            if value is None:
+                continue
+            if column in self.numeric_columns:
+                try:
+                    number = float(value)
+                except (TypeError, ValueError):
+                    errors.append(f"feature '{column}' must be numeric, got {value!r}")
+                    continue
+                if math.isinf(number):
+                    errors.append(f"feature '{column}' must be finite, got {value!r}")
+                coerced[column] = number
+            elif isinstance(value, (dict, list)):
+                errors.append(f"feature '{column}' must be a scalar, got {value!r}")
+            else:
+                coerced[column] = str(value)
+        return coerced, errors
+
+    def predict_proba(self, records: list) -> np.ndarray:
+        X = pd.DataFrame.from_records(records, columns=self.feature_columns or None)
+        if self._compact is not None:
+            return self._compact.predict_proba(self.model[:-1].transform(X))[:, 1]
+        return self.model.predict_proba(X)[:, 1]
+
+
+class ServiceMetrics:
+    """
+    Request/batch counters and a sliding window of latencies for /metrics.
+    """
+
+    def __init__(self, window: int = 10000):
+        self.requests = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.latencies = deque(maxlen=window)
+        self.batch_seconds = deque(maxlen=window)
+        self.started_at = time.time()
+
+    def record_request(self, seconds: float, ok: bool = True):
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.latencies.append(seconds)
+
+    def record_batch(self, size: int, seconds: float):
+        self.batches += 1
+        self.batched_rows += size
+        self.batch_seconds.append(seconds)
+
+    def snapshot(self) -> dict:
+        latencies_ms = np.asarray(self.latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if latencies_ms.size else (0.0, 0.0, 0.0)
+        return {
+            "uptime_s": time.time() - self.started_at,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batches,
+            "avg_batch_size": self.batched_rows / self.batches if self.batches else 0.0,
+            "avg_batch_predict_ms": float(np.mean(self.batch_seconds) * 1000) if self.batch_seconds else 0.0,
+            "latency_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99)},
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-record requests into micro-batches.
+
+    A batch is flushed when it reaches max_batch_size or when max_wait_ms
+    has elapsed since its first record. Prediction runs in the default
+    thread pool so the event loop keeps accepting requests meanwhile.
+
+    Args:
+        predict_fn (callable): list[dict] -> array of probabilities.
+        max_batch_size (int): largest batch passed to predict_fn.
+        max_wait_ms (float): longest time a record waits for companions.
+        metrics (ServiceMetrics, optional): receives per-batch timings.
+    """
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0, metrics=None):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics
+        self._queue = None
+        self._task = None
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, record: dict) -> float:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future))
+        return await future
+
+    async def _collect(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            records = [record for record, _ in batch]
+
+            start = time.perf_counter()
+            try:
+                probas = await loop.run_in_executor(None, self.predict_fn, records)
+            except Exception as e:
+                if len(batch) == 1:
+                    _set_exception(batch[0][1], e)
+                    continue
+                # Rescore one record at a time so only the offending request fails
+                for record, future in batch:
+                    try:
+                        proba = (await loop.run_in_executor(None, self.predict_fn, [record]))[0]
+                    except Exception as single_error:
+                        _set_exception(future, single_error)
+                    else:
+                        _set_result(future, proba)
+                continue
+
+            if self.metrics:
+                self.metrics.record_batch(len(batch), time.perf_counter() - start)
+            for (_, future), proba in zip(batch, probas):
+                _set_result(future, proba)
+
+
+def _set_result(future, proba):
+    if not future.done():
+        future.set_result(float(proba))
+
+
+def _set_exception(future, error: Exception):
+    if not future.done():
+        future.set_exception(error)
+
+
+def _numeric_columns(model) -> list:
+    """
+    Input columns of the "num" group of a build_pipelines() model's preprocessor.
+    """
+    steps = getattr(model, "steps", [])
+    preprocessor = steps[0][1] if steps else None
+    for name, _, columns in getattr(preprocessor, "transformers_", []):
+        if name == "num":
+            return list(columns)
+    return []
+
+
+class ScoringService:
+    """
+    Minimal asyncio HTTP/1.1 server around a MicroBatcher.
+
+    Endpoints:
+        POST /score   - body: one application as a JSON object;
+                        returns probability, decision and model_uri
+        GET  /health  - liveness (200 while the process is up)
+        GET  /ready   - readiness (503 until the champion is loaded)
+        GET  /metrics - request counts, batch sizes, latency percentiles
+                        and score-cache hit rate
+
+    The pointer file is re-read every pointer_check_seconds; when evaluate
+    promotes a new champion the service loads it, swaps it in for new
+    requests and invalidates the score cache.
+
+    The decision threshold is required rather than read from a relative
+    config path; main() resolves it from --threshold or --training_config.
+    """
+
+    def __init__(
+        self,
+        pointer_file: str,
+        threshold: float,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        compact_trees: bool = False,
+        cache: ScoreCache = None,
+        pointer_check_seconds: float = 5.0
+    ):
+        self.pointer_file = pointer_file
+        self.threshold = threshold
+        self.compact_trees = compact_trees
+        self.cache = cache
+        self.pointer_check_seconds = pointer_check_seconds
+        self.metrics = ServiceMetrics()
+        self.model = None
+        self._watcher = None
+        self.batcher = MicroBatcher(
+            self._predict, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, metrics=self.metrics
+        )
+
+    @staticmethod
+    def _predict(items: list) -> np.ndarray:
+        # Each item carries the model it was admitted under, so a batch that
+        # straddles a reload is still scored (and cached) consistently
+        probas = np.empty(len(items))
+        for model in {id(m): m for m, _ in items}.values():
+            rows = [i for i, (m, _) in enumerate(items) if m is model]
+            probas[rows] = model.predict_proba([items[i][1] for i in rows])
+        return probas
+
+    async def load(self):
+        loop = asyncio.get_running_loop()
+        self.model = await loop.run_in_executor(
+            None, ScoringModel.from_pointer, self.pointer_file, self.compact_trees
+        )
+        print(f"Loaded champion model {self.model.model_uri}")
+
+    async def reload_if_promoted(self) -> bool:
+        """
+        Load the champion named by the pointer file if it is not the one being served.
+
+        Returns:
+            bool: True when a new model was swapped in.
+        """
+        loop = asyncio.get_running_loop()
+        model_uri = await loop.run_in_executor(None, read_model_pointer, self.pointer_file)
+        if self.model is not None and model_uri == self.model.model_uri:
+            return False
+        previous = self.model.model_uri if self.model else None
+        await self.load()
+        if self.cache:
+            self.cache.invalidate()
+        print(f"Champion changed from {previous} to {self.model.model_uri}")
+        return True
+
+    async def _watch_pointer(self):
+        while True:
+            await asyncio.sleep(self.pointer_check_seconds)
+            try:
+                await self.reload_if_promoted()
+            except Exception as e:
+                # Keep serving the current champion until the new one loads
+                print(f"Champion reload failed: {e}")
+
+    async def score(self, body: bytes) -> tuple[int, dict]:
+        model = self.model
+        if model is None:
+            return 503, {"error": "model not loaded"}
+        try:
+            record = json.loads(body)
+        except json.JSONDecodeError:
+            return 400, {"error": "body must be a JSON object"}
+        if not isinstance(record, dict):
+            return 400, {"error": "body must be a JSON object"}
+
+        # Reject malformed records up front so they cannot fail a whole batch
+        record, errors = model.coerce_record(record)
+        if errors:
+            return 400, {"error": "; ".join(errors)}
+
+        # Re-submitted applications (retries, pre-qualification) skip the model
+        proba = self.cache.get(record, model.model_uri) if self.cache else None
+        if proba is None:
+            proba = await self.batcher.submit((model, record))
+            if self.cache:
+                self.cache.put(record, model.model_uri, proba)
+
+        return 200, {
+            "probability": proba,
+            "decision": int(proba >= self.threshold),
+            "threshold": self.threshold,
+            "model_uri": model.model_uri,
+        }
+
+    async def route(self, method: str, path: str, body: bytes) -> tuple[int, dict]:
+        if method == "POST" and path == "/score":
+            return await self.score(body)
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/ready":
+            if self.model is None:
+                return 503, {"status": "loading"}
+            return 200, {"status": "ready", "model_uri": self.model.model_uri}
+        if method == "GET" and path == "/metrics":
+            snapshot = self.metrics.snapshot()
+            if self.cache:
+                snapshot["cache"] = self.cache.stats()
+            return 200, snapshot
+        return 404, {"error": f"no route for {method} {path}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                start = time.perf_counter()
+                try:
+                    status, payload = await self.route(method, path, body)
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                if path == "/score":
+                    self.metrics.record_request(time.perf_counter() - start, ok=status == 200)
+
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                writer.write(_format_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "0.0.0.0", port: int = 8080):
+        await self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        print(f"Scoring service listening on {host}:{port}")
+        # Start accepting health checks while the model loads
+        await self.load()
+        if self.pointer_check_seconds > 0:
+            self._watcher = asyncio.create_task(self._watch_pointer())
+        async with server:
+            await server.serve_forever()
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+async def _read_request(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, value = line.decode("latin-1").split(":", 1)
+        headers[key.strip().lower()] = value.strip()
+
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return method, path, headers, body
+
+
+def _format_response(status: int, payload: dict, keep_alive: bool = True) -> bytes:
+    body = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--best_model_pointer_file", type=str, required=True, help="Pointer file written by the evaluate component")
+    parser.add_argument("--host", type=str, default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--threshold", type=float, default=None, help="Decision threshold override (default: training_config.yaml decision_threshold)")
+    parser.add_argument("--training_config", type=str, default="./configs/training_config.yaml", help="Training config holding decision_threshold")
+    parser.add_argument("--max_batch_size", type=int, default=64, help="Largest micro-batch passed to predict_proba")
+    parser.add_argument("--max_wait_ms", type=float, default=2.0, help="Longest wait for a micro-batch to fill")
+    parser.add_argument("--compact_trees", action="store_true", help="Score RF/XGB champions with the compact tree predictor")
+    parser.add_argument("--feature_groups", type=str, default="./configs/feature_groups.yaml", help="Feature groups YAML defining the cache key columns")
+    parser.add_argument("--cache_size", type=int, default=100000, help="Max cached scores (0 disables the cache)")
+    parser.add_argument("--cache_ttl_s", type=float, default=900.0, help="Lifetime of a cached score in seconds")
+    parser.add_argument("--pointer_check_s", type=float, default=5.0, help="Interval between champion pointer checks (0 disables reloads)")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache_size > 0:
+        with open(args.feature_groups, "r") as f:
+            feature_groups = yaml.safe_load(f)
+        cache = ScoreCache(
+            feature_group_columns(feature_groups),
+            max_entries=args.cache_size,
+            ttl_seconds=args.cache_ttl_s,
+        )
+
+    service = ScoringService(
+        pointer_file=args.best_model_pointer_file,
+        threshold=args.threshold if args.threshold is not None else load_decision_threshold(args.training_config),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        compact_trees=args.compact_trees,
+        cache=cache,
+        pointer_check_seconds=args.pointer_check_s,
+    )
+    asyncio.run(service.serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
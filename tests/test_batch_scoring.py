@@ -0,0 +1,86 @@
+import mlflow.sklearn
+import numpy as np
+import pandas as pd
+import pytest
+from utilities.ml_processes import build_preprocessor
+from utilities.model_factory import build_pipelines
+from utilities.batch_scoring import score_csv_in_chunks
+
+
+def _fit_and_save(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Duration": rng.integers(6, 60, 50),
+        "Housing": rng.choice(["own", "rent", "free"], 50),
+        "Job": rng.choice(["a", "b", "c"], 50),
+        "CreditRisk": rng.integers(0, 2, 50),
+    })
+    feature_groups = {"num_cols": ["Duration"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]}
+    pipeline = build_pipelines([{"model": "logreg", "params": {"max_iter": 100}}], build_preprocessor(feature_groups))["logreg"]
+    pipeline.fit(df.drop(columns=["CreditRisk"]), df["CreditRisk"])
+
+    model_path = str(tmp_path / "model")
+    mlflow.sklearn.save_model(pipeline, model_path)
+    df.to_csv(tmp_path / "input.csv", index=False)
+    return df, pipeline, model_path
+
+
+def test_score_csv_in_chunks_matches_in_memory(tmp_path):
+    """Chunked multiprocess scoring matches predict_proba and keeps row order/ids."""
+    df, pipeline, model_path = _fit_and_save(tmp_path)
+    X = df.drop(columns=["CreditRisk"])
+
+    n_rows = score_csv_in_chunks(
+        model_uri=model_path,
+        input_path=str(tmp_path / "input.csv"),
+        output_path=str(tmp_path / "scores.csv"),
+        chunksize=7,
+        n_workers=2,
+        threshold=0.5,
+    )
+
+    scores = pd.read_csv(tmp_path / "scores.csv")
+    assert n_rows == len(df)
+    assert list(scores.columns) == ["row_id", "probability", "decision"]
+    assert list(scores["row_id"]) == list(range(len(df)))
+    assert np.allclose(scores["probability"], pipeline.predict_proba(X)[:, 1])
+
+    score_csv_in_chunks(
+        model_uri=model_path,
+        input_path=str(tmp_path / "input.csv"),
+        output_path=str(tmp_path / "reasons.csv"),
+        chunksize=20,
+        n_workers=1,
+        n_reasons=2,
+        background_path=str(tmp_path / "input.csv"),
+    )
+    reasons = pd.read_csv(tmp_path / "reasons.csv")
+    assert list(reasons.columns[2:]) == ["reason_1", "reason_2", "contribution_1", "contribution_2"]
+    assert reasons["reason_1"].dropna().isin(["Duration", "Housing", "Job"]).all()
+
+
+def test_id_col_is_used_and_must_exist(tmp_path):
+    """A given id_col becomes the output id; a missing one fails instead of falling back to row_id."""
+    df, pipeline, model_path = _fit_and_save(tmp_path)
+    df.insert(0, "AccountId", [f"A{i:03d}" for i in range(len(df))])
+    df.to_csv(tmp_path / "with_ids.csv", index=False)
+
+    score_csv_in_chunks(model_path, str(tmp_path / "with_ids.csv"), str(tmp_path / "scores.csv"),
+                        chunksize=20, n_workers=1, id_col="AccountId")
+    scores = pd.read_csv(tmp_path / "scores.csv")
+    assert list(scores["AccountId"]) == list(df["AccountId"])
+
+    with pytest.raises(ValueError, match="AccountID"):
+        score_csv_in_chunks(model_path, str(tmp_path / "with_ids.csv"), str(tmp_path / "typo.csv"),
+                            n_workers=1, id_col="AccountID")
+
+
+def test_header_only_input_writes_header(tmp_path):
+    _, _, model_path = _fit_and_save(tmp_path)
+    pd.DataFrame(columns=["AccountId", "Duration", "Housing", "Job"]).to_csv(tmp_path / "empty.csv", index=False)
+
+    n_rows = score_csv_in_chunks(model_path, str(tmp_path / "empty.csv"), str(tmp_path / "scores.csv"),
+                                 n_workers=1, id_col="AccountId", threshold=0.5)
+    scores = pd.read_csv(tmp_path / "scores.csv")
+    assert n_rows == 0 and scores.empty
+    assert list(scores.columns) == ["AccountId", "probability", "decision"]
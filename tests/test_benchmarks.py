@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import yaml
+
+from benchmarks.run_benchmarks import (
+    compare_results, generate_german_credit, parse_size, run_suite, scaling_exponents
+)
+from utilities.data_validation import build_data_contract, validate_dataframe
+
+
+CONFIGS = Path(__file__).resolve().parents[1] / "configs"
+
+
+def test_generated_data_matches_pipeline_schema():
+    """Synthetic German-credit data passes the repo's data contract and is reproducible."""
+    with open(CONFIGS / "feature_groups.yaml") as f:
+        feature_groups = yaml.safe_load(f)
+    with open(CONFIGS / "data_contract.yaml") as f:
+        contract = build_data_contract(feature_groups, yaml.safe_load(f))
+
+    df = generate_german_credit(5000, random_state=1)
+    assert validate_dataframe(df, contract)["ok"]
+    assert abs(df["CreditRisk"].mean() - 0.3) < 0.03
+    assert df.equals(generate_german_credit(5000, random_state=1))
+
+
+def test_run_suite_and_compare_flag_regressions():
+    """Every hot path is measured per size and slowdowns beyond tolerance are flagged."""
+    feature_groups = {"num_cols": ["Duration", "Age"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Purpose"]}
+    results = run_suite([parse_size("500"), parse_size("1k")], feature_groups,
+                        [{"model": "logreg", "params": {"max_iter": 200}}], repeats=1)
+
+    names = {r["benchmark"] for r in results}
+    assert names == {"preprocess", "preprocessor_fit", "preprocessor_transform", "fit_logreg", "predict_logreg",
+                     "metrics", "bootstrap"}
+    assert all(r["resamples_per_s"] > 0 for r in results if r["benchmark"] == "bootstrap")
+    assert {r["rows"] for r in results} == {500, 1000}
+    assert set(scaling_exponents(results)) == names
+
+    baseline = [{"benchmark": "fit_rf", "rows": 1000, "wall_s_min": 1.0, "peak_mb": 10.0}]
+    slower = [{"benchmark": "fit_rf", "rows": 1000, "wall_s_min": 1.5, "peak_mb": 10.0}]
+    same = [{"benchmark": "fit_rf", "rows": 1000, "wall_s_min": 1.1, "peak_mb": 11.0}]
+    assert compare_results(baseline, slower)[0]["regression"]
+    assert not compare_results(baseline, same)[0]["regression"]
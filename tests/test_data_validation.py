@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utilities.data_validation import (
+    DataValidationError, build_data_contract, validate_dataframe, validate_csv_in_chunks
+)
+from utilities.ml_processes import clean_dataframe
+
+
+FEATURE_GROUPS = {"num_cols": ["Duration", "Age"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]}
+CONTRACT_CONFIG = {
+    "max_null_rate": 0.1,
+    "ranges": {"Age": [18, 120]},
+    "category_domains": {"Housing": ["own", "rent", "for free"]},
+}
+
+
+def _frame():
+    return pd.DataFrame({
+        "Duration": [6, 12, 24, 36, 48, 60],
+        "Age": [25, 40, 33, 51, 29, 62],
+        "Housing": ["own", "rent", "for free", "own", "rent", "own"],
+        "Job": ["a", "b", "c", "a", "b", "c"],
+        "CreditRisk": [0, 1, 0, 1, 0, 1],
+    })
+
+
+def test_valid_frame_passes():
+    contract = build_data_contract(FEATURE_GROUPS, CONTRACT_CONFIG)
+    report = validate_dataframe(_frame(), contract, stratify_col="CreditRisk")
+    assert report["ok"] and report["errors"] == []
+
+
+def test_all_violations_reported_together(tmp_path):
+    """Every broken check ends up in one consolidated report, for frames and chunked CSVs."""
+    df = _frame()
+    df["Age"] = [25, 40, 12, 51, 29, np.nan]             # out of range + 1/6 nulls
+    df["Housing"] = ["own", "rent", "castle", "own", "rent", "own"]
+    df["CreditRisk"] = [0, 2, 0, 1, 0, 1]
+    df = df.drop(columns=["Job"])
+    contract = build_data_contract(FEATURE_GROUPS, CONTRACT_CONFIG)
+
+    with pytest.raises(DataValidationError) as exc:
+        validate_dataframe(df, contract, stratify_col="target")
+    errors = " | ".join(exc.value.report["errors"])
+    for expected in ("Missing required columns: ['Job', 'target']", "Null rate of 'Age'",
+                     "values of 'Age' outside", "'castle'", "values outside [0, 1]: [2]"):
+        assert expected in errors
+
+    df.to_csv(tmp_path / "bad.csv", index=False)
+    chunked = validate_csv_in_chunks(
+        str(tmp_path / "bad.csv"), contract, chunksize=2, stratify_col="target", raise_on_error=False
+    )
+    assert chunked["errors"] == exc.value.report["errors"]
+
+
+def test_categorical_columns_checked_for_labels_and_domain():
+    """Label-encoded categoricals and unseen labels fail; categoricals without a domain only warn."""
+    df = _frame()
+    df["Job"] = [0, 1, 2, 0, 1, 2]
+    df["Housing"] = ["own", "rent", "for free", "own", "rent", "hotel"]
+    contract = build_data_contract(FEATURE_GROUPS, CONTRACT_CONFIG)
+
+    report = validate_dataframe(df, contract, raise_on_error=False)
+    assert report["errors"] == [
+        "Non-categorical dtype in categorical cols: ['Job']",
+        "Unseen categories in 'Housing': ['hotel']",
+    ]
+    assert any("without a domain" in w and "'Job'" in w for w in report["warnings"])
+
+
+def test_validation_runs_on_cleaned_frame():
+    """Rows the preprocess hygiene drops do not count against null-rate limits."""
+    df = _frame()
+    df["Age"] = [25, np.nan, 33, np.nan, 29, 62]
+    contract = build_data_contract(FEATURE_GROUPS, CONTRACT_CONFIG)
+
+    assert not validate_dataframe(df, contract, raise_on_error=False)["ok"]
+    cleaned = clean_dataframe(df, dropna_cols=["Age"])
+    assert validate_dataframe(cleaned, contract)["null_rates"]["Age"] == 0.0
@@ -0,0 +1,116 @@
+import json
+import time
+
+import mlflow
+import numpy as np
+import pytest
+
+from utilities.instrumentation import Tracer
+
+
+def test_nested_spans_report_self_time():
+    """A parent's self time excludes the wall time of its child spans."""
+    tracer = Tracer()
+    with tracer.span("train"):
+        with tracer.span("final_fit"):
+            time.sleep(0.05)
+        time.sleep(0.02)
+
+    table = tracer.summary()
+    assert list(table.index) == ["final_fit", "train"]
+    assert table.loc["train", "wall_s"] >= 0.07
+    assert table.loc["train", "self_s"] == pytest.approx(
+        table.loc["train", "wall_s"] - table.loc["final_fit", "wall_s"], abs=1e-9
+    )
+    assert table["share"].sum() == pytest.approx(1.0)
+    assert (table["max_rss_mb"] > 0).all()
+
+
+def test_recorded_spans_do_not_reduce_parent_self_time():
+    """Externally measured spans (e.g. parallel CV folds) get their own tracks and leave the parent's self time alone."""
+    tracer = Tracer()
+    with tracer.span("cross_validate"):
+        for i in range(3):
+            tracer.record("cv_fold", 0.5, track=f"cv_fold_{i}", fold=i)
+
+    table = tracer.summary()
+    assert table.loc["cv_fold", "count"] == 3
+    assert table.loc["cv_fold", "wall_s"] == pytest.approx(1.5)
+    assert table.loc["cross_validate", "self_s"] == table.loc["cross_validate", "wall_s"]
+    assert np.isnan(table.loc["cv_fold", "share"])
+    assert table.loc["cross_validate", "share"] == pytest.approx(1.0)
+
+
+def test_chrome_trace_is_valid_json():
+    """The trace has one complete event per span, strict JSON, and named tracks."""
+    tracer = Tracer()
+    with tracer.span("csv_parse", path="train.csv"):
+        pass
+    tracer.record("score_chunk", 0.01, track="workers")
+
+    trace = tracer.chrome_trace(process_name="score")
+    events = json.loads(json.dumps(trace, allow_nan=False))["traceEvents"]
+
+    complete = [e for e in events if e["ph"] == "X"]
+    assert [e["name"] for e in complete] == ["csv_parse", "score_chunk"]
+    assert complete[0]["args"]["path"] == "train.csv"
+    assert complete[1]["args"]["cpu_s"] is None
+    thread_names = {e["args"]["name"] for e in events if e["name"] == "thread_name"}
+    assert "workers" in thread_names
+
+
+def test_mlflow_metric_names_are_sanitised():
+    tracer = Tracer()
+    with tracer.span("train_xgb@v2"):
+        pass
+    tracer.record("cv_fold", 0.1)
+
+    metrics = tracer.mlflow_metrics()
+    assert {"span_train_xgb_v2_wall_s", "span_train_xgb_v2_self_s",
+            "span_train_xgb_v2_cpu_s", "span_train_xgb_v2_max_rss_mb"} <= set(metrics)
+    assert "span_cv_fold_wall_s" in metrics
+    assert "span_cv_fold_cpu_s" not in metrics
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("preprocess"):
+        pass
+    tracer.record("cv_fold", 0.1)
+
+    assert tracer.spans == []
+    assert tracer.summary().empty
+
+
+def test_span_overhead_is_small():
+    """Wrapping a stage costs microseconds, far below any stage worth timing."""
+    tracer = Tracer()
+    n = 10_000
+    start = time.perf_counter()
+    for _ in range(n):
+        with tracer.span("noop"):
+            pass
+    per_span = (time.perf_counter() - start) / n
+
+    assert per_span < 1e-4
+
+
+def test_export_logs_metrics_and_trace_artifact(tmp_path):
+    """export() logs span metrics and the Chrome trace to a new run and writes trace_path."""
+    previous_uri = mlflow.get_tracking_uri()
+    mlflow.set_tracking_uri("file:" + str(tmp_path / "mlruns"))
+    try:
+        tracer = Tracer()
+        with tracer.span("csv_parse"):
+            pass
+        tracer.export("preprocess", trace_path=str(tmp_path / "trace.json"))
+
+        run = mlflow.search_runs(output_format="list")[0]
+        artifacts = [a.path for a in mlflow.MlflowClient().list_artifacts(run.info.run_id, "traces")]
+    finally:
+        mlflow.set_tracking_uri(previous_uri)
+
+    assert "span_csv_parse_wall_s" in run.data.metrics
+    assert artifacts == ["traces/preprocess.json"]
+    with open(tmp_path / "trace.json") as f:
+        assert json.load(f)["traceEvents"]
@@ -0,0 +1,78 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines"))
+from local_runner import LocalStep, build_local_steps, run_dag, write_local_outputs  # noqa: E402
+
+
+def test_run_dag_runs_independent_steps_concurrently():
+    """Independent steps overlap and outputs flow along the dependencies."""
+    def sleep_then(value):
+        def fn(_):
+            time.sleep(0.3)
+            return value
+        return fn
+
+    steps = [
+        LocalStep("join", lambda inputs: inputs["a"] + inputs["b"], ["a", "b"]),
+        LocalStep("a", sleep_then(1)),
+        LocalStep("b", sleep_then(2)),
+    ]
+    outputs, timings = run_dag(steps)
+
+    assert outputs["join"] == 3
+    assert timings["join"]["start_s"] >= max(timings["a"]["end_s"], timings["b"]["end_s"])
+    assert timings["join"]["end_s"] < 0.55
+
+
+def test_local_pipeline_end_to_end(tmp_path):
+    """The in-memory DAG trains every candidate and evaluates the champion against a file MLflow store."""
+    rng = np.random.default_rng(0)
+    n = 300
+    df = pd.DataFrame({
+        "Duration": rng.integers(6, 60, n),
+        "Housing": rng.choice(["own", "rent", "free"], n),
+        "Job": rng.choice(["a", "b", "c"], n),
+    })
+    df["CreditRisk"] = (df["Duration"] + rng.normal(0, 10, n) > 35).astype(int)
+
+    uri = "file:" + str(tmp_path / "mlruns")
+    mlflow.set_tracking_uri(uri)
+    mlflow.set_registry_uri(uri)
+    try:
+        steps = build_local_steps(
+            df,
+            candidates=[
+                {"model": "logreg", "params": {"max_iter": 200}},
+                {"model": "rf", "params": {"n_estimators": 20, "max_depth": 3}},
+            ],
+            feature_groups={"num_cols": ["Duration"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]},
+            preprocess_config={
+                "split": {"test_size": 0.25, "random_state": 0, "stratify_col": "CreditRisk"},
+                "cleaning": {"dropna_cols": [], "drop_duplicates": False},
+            },
+            global_params={"cv_folds": 2, "decision_threshold": 0.5},
+            selection_criteria={"primary": "auc_roc", "min_threshold": 0.5},
+            score_all_candidates=True,
+        )
+        outputs, timings = run_dag(steps)
+    finally:
+        mlflow.set_tracking_uri(None)
+        mlflow.set_registry_uri(None)
+
+    assert set(timings) == {"ingest", "preprocess", "train_logreg", "train_rf", "evaluate"}
+    result = outputs["evaluate"]
+    assert len(outputs["preprocess"]["test"]) == 75
+    assert result["metrics"]["auc_roc"] > 0.7
+    assert result["best"]["model_uri"] in set(result["candidates_metrics"]["model_uri"])
+
+    write_local_outputs(result, timings, str(tmp_path / "out"))
+    with open(tmp_path / "out" / "best_model_pointer.txt") as f:
+        assert f.read() == result["best"]["model_uri"]
+    assert set(json.loads((tmp_path / "out" / "timings.json").read_text())) == set(timings)
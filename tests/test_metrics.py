@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+from sklearn.metrics import (
+    roc_auc_score, accuracy_score, precision_score, recall_score, f1_score, brier_score_loss
+)
+from utilities.metrics import (
+    binary_classification_metrics, bootstrap_metrics, bootstrap_summary, threshold_curve
+)
+from utilities.ml_processes import build_preprocessor
+from utilities.model_factory import build_pipelines
+from utilities.mlflow_processes import predict_candidates_proba
+
+
+def test_binary_classification_metrics_matches_sklearn():
+    """Vectorized metrics agree with sklearn for single and stacked candidates."""
+    rng = np.random.default_rng(0)
+    y = rng.integers(0, 2, 500)
+    proba = np.vstack([rng.random(500), np.round(rng.random(500), 1)])  # second has ties
+
+    batch = binary_classification_metrics(y, proba, threshold=0.3)
+    for i in range(2):
+        y_pred = (proba[i] >= 0.3).astype(int)
+        expected = {
+            "auc_roc": roc_auc_score(y, proba[i]),
+            "accuracy": accuracy_score(y, y_pred),
+            "precision": precision_score(y, y_pred),
+            "recall": recall_score(y, y_pred),
+            "f1": f1_score(y, y_pred),
+            "brier_score": brier_score_loss(y, proba[i]),
+        }
+        single = binary_classification_metrics(y, proba[i], threshold=0.3)
+        for k, v in expected.items():
+            assert np.isclose(batch[k][i], v)
+            assert np.isclose(single[k], v)
+
+
+def test_predict_candidates_proba_shares_transform():
+    """Scoring several pipelines at once matches each pipeline's predict_proba."""
+    df = pd.DataFrame({
+        "Duration": [6, 12, 24, 36, 48, 60, 9, 18],
+        "Housing": ["own", "rent", "free", "own", "rent", "free", "own", "rent"],
+        "Job": ["a", "b", "c", "a", "b", "c", "a", "b"],
+        "CreditRisk": [0, 1, 0, 1, 0, 1, 1, 0],
+    })
+    feature_groups = {"num_cols": ["Duration"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]}
+    candidates = [
+        {"model": "logreg", "params": {"max_iter": 50}},
+        {"model": "rf", "params": {"n_estimators": 5, "max_depth": 2, "random_state": 0}},
+    ]
+    X, y = df.drop(columns=["CreditRisk"]), df["CreditRisk"]
+    models = []
+    for cand in candidates:
+        pipeline = build_pipelines([cand], build_preprocessor(feature_groups))[cand["model"]]
+        models.append(pipeline.fit(X, y))
+
+    proba = predict_candidates_proba(models, X)
+    assert proba.shape == (2, len(X))
+    for i, model in enumerate(models):
+        assert np.allclose(proba[i], model.predict_proba(X)[:, 1])
+
+
+def test_bootstrap_metrics_paired_and_deterministic():
+    """Bootstrap AUC matches sklearn on each resample and runs are reproducible."""
+    rng = np.random.default_rng(1)
+    y = rng.integers(0, 2, 200)
+    proba = np.vstack([np.clip(0.4 * y + rng.random(200) * 0.6, 0, 1), np.round(rng.random(200), 1)])
+
+    samples = bootstrap_metrics(y, proba, threshold=0.5, n_resamples=20, chunk_size=7, random_state=3)
+    again = bootstrap_metrics(y, proba, threshold=0.5, n_resamples=20, chunk_size=7, random_state=3)
+    assert samples["auc_roc"].shape == (2, 20)
+    assert np.array_equal(samples["auc_roc"], again["auc_roc"])
+
+    # Rebuild the first resample's rows and check against sklearn; draws index
+    # positions in the first candidate's sorted order
+    seed = np.random.SeedSequence(3).spawn(3)[0]
+    positions = np.random.default_rng(seed).integers(0, 200, size=(7, 200))[0]
+    idx = np.argsort(proba[0], kind="mergesort")[positions]
+    for i in range(2):
+        assert np.isclose(samples["auc_roc"][i, 0], roc_auc_score(y[idx], proba[i, idx]))
+        assert np.isclose(samples["brier_score"][i, 0], brier_score_loss(y[idx], proba[i, idx]))
+        assert np.isclose(samples["recall"][i, 0], recall_score(y[idx], (proba[i, idx] >= 0.5).astype(int)))
+
+    summary = bootstrap_summary(samples, ["good", "random"], reference=0)
+    diff = summary["paired_differences"]["random - good"]["auc_roc"]
+    assert diff["upper"] < 0 and diff["p_value"] < 0.05
+    interval = summary["intervals"]["good"]["auc_roc"]
+    assert interval["lower"] <= interval["mean"] <= interval["upper"]
+
+
+def test_threshold_curve_matches_pointwise_metrics():
+    """Each row of the curve equals the metrics computed at that single threshold."""
+    rng = np.random.default_rng(2)
+    y = rng.integers(0, 2, 300)
+    proba = np.round(rng.random(300), 2)
+
+    curve = threshold_curve(y, proba, cost_fp=1.0, cost_fn=5.0)
+    assert len(curve) == 101
+
+    for t in (0.0, 0.05, 0.08, 0.5, 1.0):
+        row = curve.loc[np.isclose(curve["threshold"], t)].iloc[0]
+        point = binary_classification_metrics(y, proba, threshold=t)
+        for k in ("precision", "recall", "f1"):
+            assert np.isclose(row[k], point[k])
+        y_pred = proba >= t
+        fp, fn = (y_pred & (y == 0)).sum(), (~y_pred & (y == 1)).sum()
+        assert np.isclose(row["expected_cost"], (fp + 5 * fn) / len(y))
+
+
+def test_bootstrap_summary_all_nan_differences():
+    """Resamples that never contain both classes give NaN bounds instead of raising."""
+    samples = {"auc_roc": np.full((2, 10), np.nan), "recall": np.vstack([np.full(10, 0.5), np.full(10, 0.4)])}
+    summary = bootstrap_summary(samples, ["champion", "challenger"], reference=0)
+
+    auc = summary["paired_differences"]["challenger - champion"]["auc_roc"]
+    assert all(np.isnan(auc[k]) for k in ("mean_diff", "lower", "upper", "p_value"))
+    assert np.isnan(summary["intervals"]["champion"]["auc_roc"]["lower"])
+    recall = summary["paired_differences"]["challenger - champion"]["recall"]
+    assert np.isclose(recall["mean_diff"], -0.1)
@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import cross_validate
+
+from utilities.mlflow_processes import out_of_fold_proba
+
+
+def test_out_of_fold_proba_scores_each_row_with_its_held_out_model():
+    """Every row gets a score from the fold model that did not train on it; in-sample RF scores are overconfident."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({"a": rng.normal(size=400), "b": rng.normal(size=400)})
+    y = (X["a"] + rng.normal(scale=1.5, size=400) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=50, random_state=0)
+
+    cv_results = cross_validate(model, X, y, cv=4, return_estimator=True, return_indices=True)
+    oof = out_of_fold_proba(cv_results, X)
+
+    assert not np.isnan(oof).any()
+    rows = cv_results["indices"]["test"][2]
+    np.testing.assert_allclose(oof[rows], cv_results["estimator"][2].predict_proba(X.iloc[rows])[:, 1])
+
+    in_sample = model.fit(X, y).predict_proba(X)[:, 1]
+    assert np.abs(in_sample - 0.5).mean() > np.abs(oof - 0.5).mean()
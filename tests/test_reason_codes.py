@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from scipy.special import logit
+from utilities.ml_processes import build_preprocessor
+from utilities.model_factory import build_pipelines
+from utilities.reason_codes import ReasonCodeEngine
+
+
+def _fit(model, params):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Duration": rng.integers(6, 60, 200),
+        "CreditAmount": rng.integers(500, 15000, 200),
+        "Housing": rng.choice(["own", "rent", "free"], 200),
+        "Job": rng.choice(["a", "b", "c", "d"], 200),
+    })
+    df["CreditRisk"] = ((df["Duration"] > 30) ^ (rng.random(200) < 0.2)).astype(int)
+    feature_groups = {
+        "num_cols": ["Duration", "CreditAmount"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]
+    }
+    pipeline = build_pipelines([{"model": model, "params": params}], build_preprocessor(feature_groups))[model]
+    X = df.drop(columns=["CreditRisk"])
+    return pipeline.fit(X, df["CreditRisk"]), X
+
+
+def test_reason_codes_are_additive_for_each_model_type():
+    """Contributions are per original column and sum to the model output minus its baseline."""
+    cases = [
+        ("logreg", {"max_iter": 200}),
+        ("rf", {"n_estimators": 10, "max_depth": 4, "random_state": 0}),
+        ("xgb", {"n_estimators": 10, "max_depth": 3}),
+    ]
+    for model, params in cases:
+        pipeline, X = _fit(model, params)
+        engine = ReasonCodeEngine(pipeline, background=X)
+        contrib = engine.contributions(X)
+        assert list(contrib.columns) == ["Duration", "CreditAmount", "Housing", "Job"]
+
+        proba = pipeline.predict_proba(X)[:, 1]
+        output = proba if model == "rf" else logit(proba)
+        # Baseline is constant across rows, so output - sum(contributions) must be too
+        residual = output - contrib.sum(axis=1).to_numpy()
+        assert np.allclose(residual, residual[0], atol=1e-4)
+
+        reasons = engine.top_reasons(X, k=2)
+        assert list(reasons.columns) == ["reason_1", "reason_2", "contribution_1", "contribution_2"]
+        long = X["Duration"] > 40
+        assert (reasons.loc[long, "reason_1"] == "Duration").mean() > 0.5
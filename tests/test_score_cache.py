@@ -0,0 +1,42 @@
+import numpy as np
+from utilities.score_cache import ScoreCache, feature_group_columns, record_key
+
+
+FEATURE_GROUPS = {"num_cols": ["Duration"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]}
+
+
+def test_record_key_is_canonical():
+    """Key ignores non-feature fields and numeric representation, but not the model."""
+    columns = feature_group_columns(FEATURE_GROUPS)
+    a = {"Duration": 12, "Housing": "own", "Job": "a", "request_id": "r1"}
+    b = {"Job": "a", "Housing": "own", "Duration": np.float64(12.0), "request_id": "r2"}
+    assert record_key(a, columns, "models:/m/1") == record_key(b, columns, "models:/m/1")
+    assert record_key(a, columns, "models:/m/1") != record_key(a, columns, "models:/m/2")
+    assert record_key(a, columns, "models:/m/1") != record_key({**a, "Duration": 13}, columns, "models:/m/1")
+
+
+def test_score_cache_lru_ttl_and_invalidation():
+    """Puts are served back per model; LRU, TTL and invalidate() evict."""
+    cache = ScoreCache(feature_group_columns(FEATURE_GROUPS), max_entries=2, ttl_seconds=60)
+
+    records = [{"Duration": d, "Housing": "own", "Job": "a"} for d in (10, 20)]
+    assert cache.get(records[0], "models:/m/1") is None
+    for record in records:
+        cache.put(record, "models:/m/1", record["Duration"] / 100)
+    assert cache.get(records[0], "models:/m/2") is None  # other model, other key
+
+    assert cache.get(records[0], "models:/m/1") == 0.1
+    cache.put({"Duration": 30, "Housing": "own", "Job": "a"}, "models:/m/1", 0.3)
+    assert cache.get(records[1], "models:/m/1") is None  # least recently used, evicted
+    assert cache.stats()["evictions"] >= 1
+
+    cache.ttl_seconds = 0
+    cache.put(records[1], "models:/m/1", 0.2)
+    assert cache.get(records[1], "models:/m/1") is None
+    assert cache.stats()["expirations"] == 1
+
+    cache.get(records[0], "models:/m/1")
+    cache.invalidate()
+    stats = cache.stats()
+    assert stats["invalidations"] == 1 and stats["size"] == 0
+    assert 0 < stats["hit_rate"] < 1
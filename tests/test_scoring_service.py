@@ -0,0 +1,178 @@
+import asyncio
+import json
+import numpy as np
+import pandas as pd
+from utilities.ml_processes import build_preprocessor
+from utilities.model_factory import build_pipelines
+from serving.scoring_service import MicroBatcher, ScoringModel, ScoringService
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    """Concurrent submits are served by a few batched predict calls, in order."""
+    batch_sizes = []
+
+    def predict(records):
+        batch_sizes.append(len(records))
+        return np.array([r["x"] * 0.1 for r in records])
+
+    async def run():
+        batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        results = await asyncio.gather(*[batcher.submit({"x": i}) for i in range(20)])
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert np.allclose(results, [i * 0.1 for i in range(20)])
+    assert max(batch_sizes) == 8
+    assert len(batch_sizes) == 3
+
+
+def test_scoring_service_routes():
+    """Score, readiness and metrics endpoints work against a fitted pipeline."""
+    df = pd.DataFrame({
+        "Duration": [6, 12, 24, 36, 48, 60],
+        "Housing": ["own", "rent", "free", "own", "rent", "free"],
+        "Job": ["a", "b", "c", "a", "b", "c"],
+        "CreditRisk": [0, 1, 0, 1, 0, 1],
+    })
+    feature_groups = {"num_cols": ["Duration"], "simple_cat_cols": ["Housing"], "complex_cat_cols": ["Job"]}
+    pipeline = build_pipelines(
+        [{"model": "rf", "params": {"n_estimators": 5, "max_depth": 2, "random_state": 0}}],
+        build_preprocessor(feature_groups)
+    )["rf"]
+    X = df.drop(columns=["CreditRisk"])
+    pipeline.fit(X, df["CreditRisk"])
+
+    async def run():
+        service = ScoringService(pointer_file="unused", threshold=0.5, max_wait_ms=1)
+        assert (await service.route("GET", "/ready", b""))[0] == 503
+        service.model = ScoringModel(pipeline, "models:/credit_model_rf/1", compact_trees=True)
+        await service.batcher.start()
+
+        record = X.iloc[0].to_dict()
+        status, payload = await service.route("POST", "/score", json.dumps(record).encode())
+        bad_status, _ = await service.route("POST", "/score", json.dumps({"Duration": 6}).encode())
+        ready_status, _ = await service.route("GET", "/ready", b"")
+        await service.batcher.stop()
+        return status, payload, bad_status, ready_status, service.metrics.snapshot()
+
+    status, payload, bad_status, ready_status, metrics = asyncio.run(run())
+    assert status == 200 and ready_status == 200 and bad_status == 400
+    assert np.isclose(payload["probability"], pipeline.predict_proba(X.iloc[[0]])[0, 1])
+    assert metrics["batches"] == 1
+
+
+def test_bad_record_fails_alone():
+    """A non-numeric value is a 400 for its own request; a batch that fails anyway is rescored row by row."""
+    df = pd.DataFrame({
+        "Age": [25, 40, 33, 51, 29, 62],
+        "Housing": ["own", "rent", "free", "own", "rent", "free"],
+        "CreditRisk": [0, 1, 0, 1, 0, 1],
+    })
+    pipeline = build_pipelines(
+        [{"model": "rf", "params": {"n_estimators": 5, "max_depth": 2, "random_state": 0}}],
+        build_preprocessor({"num_cols": ["Age"], "simple_cat_cols": ["Housing"], "complex_cat_cols": []})
+    )["rf"]
+    pipeline.fit(df.drop(columns=["CreditRisk"]), df["CreditRisk"])
+    good, bad = {"Age": "41", "Housing": "own"}, {"Age": "abc", "Housing": "rent"}
+
+    async def run_service():
+        service = ScoringService(pointer_file="unused", threshold=0.5, max_wait_ms=20)
+        service.model = ScoringModel(pipeline, "models:/credit_model_rf/1")
+        await service.batcher.start()
+        results = await asyncio.gather(*[
+            service.route("POST", "/score", json.dumps(record).encode()) for record in (good, bad)
+        ])
+        await service.batcher.stop()
+        return results
+
+    (good_status, payload), (bad_status, error) = asyncio.run(run_service())
+    assert good_status == 200 and bad_status == 400
+    assert "Age" in error["error"]
+    assert np.isclose(payload["probability"], pipeline.predict_proba(pd.DataFrame([{"Age": 41.0, "Housing": "own"}]))[0, 1])
+
+    # Without the up-front check the batch fails in predict_proba; only the bad future gets the error
+    model = ScoringModel(pipeline, "models:/credit_model_rf/1")
+
+    async def run_batcher():
+        batcher = MicroBatcher(model.predict_proba, max_batch_size=8, max_wait_ms=20)
+        await batcher.start()
+        results = await asyncio.gather(
+            batcher.submit({"Age": 41.0, "Housing": "own"}), batcher.submit(bad), return_exceptions=True
+        )
+        await batcher.stop()
+        return results
+
+    proba, error = asyncio.run(run_batcher())
+    assert np.isclose(proba, payload["probability"])
+    assert isinstance(error, ValueError)
+
+
+def test_promotion_reloads_champion_and_invalidates_cache(tmp_path):
+    """After the pointer moves, the new champion's scores are served, not cached ones of the old model."""
+    import mlflow
+    from utilities.score_cache import ScoreCache
+
+    df = pd.DataFrame({
+        "Duration": [6, 12, 24, 36, 48, 60, 9, 30],
+        "Housing": ["own", "rent", "free", "own", "rent", "free", "own", "rent"],
+        "CreditRisk": [0, 1, 0, 1, 0, 1, 1, 0],
+    })
+    X, y = df.drop(columns=["CreditRisk"]), df["CreditRisk"]
+    feature_groups = {"num_cols": ["Duration"], "simple_cat_cols": ["Housing"], "complex_cat_cols": []}
+    uris = []
+    for seed, model in ((0, "rf"), (1, "logreg")):
+        pipeline = build_pipelines(
+            [{"model": model, "params": {"random_state": seed}}], build_preprocessor(feature_groups)
+        )[model].fit(X, y)
+        path = str(tmp_path / model)
+        mlflow.sklearn.save_model(pipeline, path)
+        uris.append(path)
+    pointer = tmp_path / "best_model_pointer.txt"
+    pointer.write_text(uris[0])
+    record = X.iloc[0].to_dict()
+
+    async def run():
+        service = ScoringService(
+            pointer_file=str(pointer), threshold=0.5, max_wait_ms=1, cache=ScoreCache(["Duration", "Housing"]),
+            pointer_check_seconds=0
+        )
+        await service.load()
+        await service.batcher.start()
+        score = lambda: service.route("POST", "/score", json.dumps(record).encode())  # noqa: E731
+        _, before = await score()
+        _, cached = await score()
+        assert not await service.reload_if_promoted()
+
+        pointer.write_text(uris[1])
+        assert await service.reload_if_promoted()
+        _, after = await score()
+        await service.batcher.stop()
+        return before, cached, after, service.cache.stats()
+
+    before, cached, after, stats = asyncio.run(run())
+    expected = mlflow.sklearn.load_model(uris[1]).predict_proba(X.iloc[[0]])[0, 1]
+    assert before["model_uri"] == cached["model_uri"] == uris[0]
+    assert after["model_uri"] == uris[1]
+    assert np.isclose(after["probability"], expected)
+    assert not np.isclose(after["probability"], before["probability"])
+    assert stats["invalidations"] == 1 and stats["hits"] == 1
+
+
+def test_service_threshold_comes_from_the_given_training_config(tmp_path, monkeypatch):
+    """The service needs an explicit cutoff; the CLI reads it from the --training_config path, not the CWD."""
+    import pytest
+    import yaml
+    from pathlib import Path
+    from utilities.ml_processes import load_decision_threshold
+
+    config_path = Path(__file__).resolve().parents[1] / "configs" / "training_config.yaml"
+    with open(config_path) as f:
+        configured = yaml.safe_load(f)["global_hyperparams"]["decision_threshold"]
+
+    monkeypatch.chdir(tmp_path)
+    assert load_decision_threshold(str(config_path)) == configured
+    assert ScoringService(pointer_file="unused", threshold=configured).threshold == configured
+    with pytest.raises(TypeError):
+        ScoringService(pointer_file="unused")
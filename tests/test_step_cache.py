@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "pipelines"))
+from step_cache import (  # noqa: E402
+    STEP_CODE, code_version, compute_step_keys, diff_step_keys, fingerprint_data, submit_and_record
+)
+
+
+ROOT = str(Path(__file__).resolve().parents[1])
+
+
+def test_step_keys_only_invalidate_downstream_steps(tmp_path):
+    """Config changes only re-key the steps that consume them (and their descendants)."""
+    data = tmp_path / "raw.csv"
+    data.write_text("a,b\n1,2\n")
+    xgb, rf = {"model": "xgb", "params": {"max_depth": 3}}, {"model": "rf", "params": {"max_depth": 5}}
+    pre, train, ev = {"test_size": 0.2}, {"candidates": [xgb, rf], "cv_folds": 5}, {"selection": "auc_roc"}
+
+    base = compute_step_keys(str(data), pre, train, ev, root=ROOT)
+    assert base == compute_step_keys(str(data), pre, train, ev, root=ROOT)
+
+    selection_only = compute_step_keys(str(data), pre, train, {"selection": "recall"}, root=ROOT)
+    assert selection_only["preprocess"] == base["preprocess"]
+    assert selection_only["train_xgb"] == base["train_xgb"]
+    assert selection_only["evaluate"] != base["evaluate"]
+
+    # Editing one candidate only re-keys its own train step (and evaluate)
+    tuned_rf = {"model": "rf", "params": {"max_depth": 8}}
+    new_candidates = compute_step_keys(str(data), pre, {"candidates": [xgb, tuned_rf], "cv_folds": 5}, ev, root=ROOT)
+    assert new_candidates["preprocess"] == base["preprocess"]
+    assert new_candidates["train_xgb"] == base["train_xgb"]
+    assert new_candidates["train_rf"] != base["train_rf"] and new_candidates["evaluate"] != base["evaluate"]
+
+    data.write_text("a,b\n1,3\n")
+    assert fingerprint_data(str(data)).startswith("sha256:")
+    new_data = compute_step_keys(str(data), pre, train, ev, root=ROOT)
+    assert all(new_data[s] != base[s] for s in base)
+
+    cache_file = tmp_path / "cache" / "keys.json"
+    assert set(diff_step_keys(base, str(cache_file)).values()) == {"run"}
+
+    # A submission that raises records nothing, so its steps still report "run"
+    def failed_submit():
+        raise RuntimeError("workspace unavailable")
+
+    with pytest.raises(RuntimeError):
+        submit_and_record(failed_submit, base, str(cache_file))
+    assert not cache_file.exists()
+
+    assert submit_and_record(lambda: "job-1", base, str(cache_file)) == "job-1"
+    with pytest.raises(RuntimeError):
+        submit_and_record(failed_submit, new_data, str(cache_file))
+    assert diff_step_keys(selection_only, str(cache_file)) == {
+        "preprocess": "reuse", "train_xgb": "reuse", "train_rf": "reuse", "evaluate": "run"
+    }
+
+
+def test_code_version_covers_transitive_utilities(tmp_path):
+    """Editing any utilities module (e.g. one only imported by mlflow_processes) re-keys every step."""
+    for rel in ("components/train/train.py", "utilities/mlflow_processes.py", "utilities/drift_monitor.py"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text("# v1\n")
+    before = {step: code_version(paths, root=str(tmp_path)) for step, paths in STEP_CODE.items()}
+
+    (tmp_path / "utilities" / "drift_monitor.py").write_text("# v2\n")
+    after = {step: code_version(paths, root=str(tmp_path)) for step, paths in STEP_CODE.items()}
+    assert all(after[step] != before[step] for step in STEP_CODE)
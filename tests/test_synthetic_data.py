@@ -0,0 +1,49 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.run_benchmarks import generate_german_credit
+from utilities.synthetic_data import fit_synthetic_profile, generate_synthetic_data, generate_synthetic_frame
+
+
+def test_synthetic_data_keeps_marginals_and_target_structure():
+    """Class prior, class-conditional category frequencies and numeric ranges follow the source."""
+    source = generate_german_credit(1000, random_state=3)
+    source.loc[:49, "Age"] = np.nan
+    profile = fit_synthetic_profile(source)
+
+    synthetic = generate_synthetic_frame(profile, 200_000, seed=0)
+    assert list(synthetic.columns) == list(source.columns)
+    assert abs(synthetic["CreditRisk"].mean() - source["CreditRisk"].mean()) < 0.01
+    assert synthetic["Duration"].dtype == np.int64
+    assert synthetic["Duration"].between(source["Duration"].min(), source["Duration"].max()).all()
+    assert abs(synthetic["Age"].isna().mean() - 0.05) < 0.01
+
+    # The target dependency survives: default rate per account status matches the source
+    expected = source.groupby("Status")["CreditRisk"].mean()
+    observed = synthetic.groupby("Status")["CreditRisk"].mean()
+    assert np.allclose(observed[expected.index], expected, atol=0.06)
+
+
+def test_generate_synthetic_data_is_deterministic_across_workers(tmp_path):
+    """Seeded per-chunk streams give the same file for any worker count, in CSV and Parquet."""
+    profile = fit_synthetic_profile(generate_german_credit(500, random_state=0))
+
+    generate_synthetic_data(profile, 2500, str(tmp_path / "one.csv"), chunk_size=600, n_workers=1, random_state=7)
+    n_rows = generate_synthetic_data(profile, 2500, str(tmp_path / "two.csv"), chunk_size=600, n_workers=2, random_state=7)
+    one, two = pd.read_csv(tmp_path / "one.csv"), pd.read_csv(tmp_path / "two.csv")
+    assert n_rows == len(one) == 2500
+    pd.testing.assert_frame_equal(one, two)
+
+    generate_synthetic_data(profile, 2500, str(tmp_path / "out.parquet"), chunk_size=600, n_workers=2, random_state=7)
+    pd.testing.assert_frame_equal(pd.read_parquet(tmp_path / "out.parquet"), one, check_dtype=False)
+
+
+def test_parquet_without_pyarrow_fails_clearly(tmp_path, monkeypatch):
+    """A missing pyarrow gives an actionable error rather than a bare ModuleNotFoundError deep in a worker."""
+    profile = fit_synthetic_profile(generate_german_credit(200, random_state=0))
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(ImportError, match="requires pyarrow"):
+        generate_synthetic_data(profile, 100, str(tmp_path / "out.parquet"), n_workers=1)
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+
+from utilities.ml_processes import build_preprocessor
+from utilities.reason_codes import transformed_feature_owners
+from utilities.target_encoding import OutOfFoldTargetEncoder
+
+
+def _frame(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    purpose = rng.choice(["car", "radio/TV", "education", "business"], n)
+    risk = {"car": 0.2, "radio/TV": 0.3, "education": 0.5, "business": 0.7}
+    y = (rng.random(n) < np.vectorize(risk.get)(purpose)).astype(int)
+    X = pd.DataFrame({"Purpose": purpose, "Job": rng.choice(["skilled", "unskilled"], n)})
+    return X, y
+
+
+def test_transform_matches_smoothed_category_means():
+    """Encodings equal (sum + m * prior) / (count + m); unseen and missing values get the prior."""
+    X, y = _frame()
+    encoder = OutOfFoldTargetEncoder(smoothing=10.0).fit(X, y)
+
+    stats = pd.DataFrame({"Purpose": X["Purpose"], "y": y}).groupby("Purpose")["y"].agg(["sum", "count"])
+    expected = (stats["sum"] + 10.0 * y.mean()) / (stats["count"] + 10.0)
+    encoded = encoder.transform(X)
+    np.testing.assert_allclose(encoded[:, 0], X["Purpose"].map(expected).to_numpy())
+
+    new = pd.DataFrame({"Purpose": ["vacation", None], "Job": ["skilled", np.nan]})
+    encoded = encoder.transform(new)
+    assert encoded[0, 0] == encoded[1, 0] == encoded[1, 1] == pytest.approx(y.mean())
+
+
+def test_fit_transform_is_out_of_fold():
+    """A training row's encoding ignores its own target; without folds it equals transform()."""
+    X = pd.DataFrame({"Purpose": ["car"] * 6 + ["business"] * 6})
+    y = np.array([1, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0])
+
+    encoder = OutOfFoldTargetEncoder(smoothing=0.0, cv=len(y))
+    oof = encoder.fit_transform(X, y)[:, 0]
+    # Every row is its own fold, so each row gets the mean of the other rows in its category
+    purpose = X["Purpose"].to_numpy()
+    expected = [y[(purpose == purpose[i]) & (np.arange(len(y)) != i)].mean() for i in range(len(y))]
+    np.testing.assert_allclose(oof, expected)
+
+    no_cv = OutOfFoldTargetEncoder(cv=0)
+    np.testing.assert_allclose(no_cv.fit_transform(X, y), no_cv.transform(X))
+
+
+def test_fewer_rows_than_folds_warns_about_in_sample_fallback():
+    X = pd.DataFrame({"Purpose": ["car", "car", "business"]})
+    y = np.array([1, 0, 1])
+
+    encoder = OutOfFoldTargetEncoder(cv=5)
+    with pytest.warns(UserWarning, match="in-sample"):
+        encoded = encoder.fit_transform(X, y)
+    np.testing.assert_allclose(encoded, encoder.transform(X))
+
+
+def test_fit_transform_is_deterministic_and_leaks_less_than_in_sample():
+    """Out-of-fold encodings of a pure-noise high-cardinality column carry no signal."""
+    rng = np.random.default_rng(1)
+    n = 5000
+    X = pd.DataFrame({"id": rng.integers(0, 1000, n).astype(str)})
+    y = rng.integers(0, 2, n)
+
+    encoder = OutOfFoldTargetEncoder(smoothing=1.0, random_state=3)
+    oof = encoder.fit_transform(X, y)[:, 0]
+    in_sample = encoder.transform(X)[:, 0]
+
+    np.testing.assert_array_equal(oof, clone(encoder).fit_transform(X, y)[:, 0])
+    assert np.corrcoef(in_sample, y)[0, 1] > 0.3
+    assert abs(np.corrcoef(oof, y)[0, 1]) < 0.1
+
+
+def test_drop_in_for_preprocessor_complex_cat_group():
+    """The complex_cat group yields one column per input, named and mapped back to its source."""
+    X, y = _frame()
+    X["Duration"] = np.arange(len(X)) % 48
+    preprocessor = build_preprocessor({
+        "num_cols": ["Duration"], "simple_cat_cols": ["Job"], "complex_cat_cols": ["Purpose"]
+    })
+    out = preprocessor.fit_transform(X, y)
+
+    assert out.shape == (len(X), 4)
+    assert list(preprocessor.get_feature_names_out()) == [
+        "num__Duration", "simple_cat__Job_skilled", "simple_cat__Job_unskilled", "complex_cat__Purpose"
+    ]
+    assert transformed_feature_owners(preprocessor) == ["Duration", "Job", "Job", "Purpose"]
+    assert np.isfinite(preprocessor.transform(X.iloc[:5])).all()
@@ -0,0 +1,38 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+from utilities.tree_ensemble import TreeEnsemble, export_tree_ensemble
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(400, 6))
+    y = (X[:, 0] + 0.5 * X[:, 1] ** 2 + rng.normal(scale=0.5, size=400) > 0.5).astype(int)
+    return X, y
+
+
+def test_export_random_forest_matches_predict_proba(tmp_path):
+    """Compact forest reproduces sklearn probabilities, also after a save/load round trip."""
+    X, y = _data()
+    model = RandomForestClassifier(n_estimators=20, max_depth=5, class_weight="balanced", random_state=0)
+    model.fit(X, y)
+
+    compact = export_tree_ensemble(model)
+    assert compact.n_trees == 20
+    assert np.allclose(compact.predict_proba(X, batch_size=64), model.predict_proba(X))
+
+    compact.save(str(tmp_path / "rf"))
+    loaded = TreeEnsemble.load(str(tmp_path / "rf"))
+    assert isinstance(loaded.feature, np.memmap)
+    assert np.allclose(loaded.predict_proba(X), model.predict_proba(X))
+
+
+def test_export_xgboost_matches_predict_proba():
+    """Compact booster reproduces xgboost probabilities, including missing values."""
+    X, y = _data()
+    X[::7, 2] = np.nan
+    model = XGBClassifier(n_estimators=30, max_depth=3, learning_rate=0.1, scale_pos_weight=2.33)
+    model.fit(X, y)
+
+    compact = export_tree_ensemble(model)
+    assert np.allclose(compact.predict_proba(X), model.predict_proba(X), atol=1e-5)
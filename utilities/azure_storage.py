@@ -45,9 +45,9 @@ def upload_json_to_blob(documents, blob_name: str, conn_str, container_name):
     print(f'Uploaded {blob_name} to Azure Blob Storage.')
 
 
-def download_csv_from_blob(blob_name: str, conn_str, container_name) -> pd.DataFrame:
+def download_bytes_from_blob(blob_name: str, conn_str, container_name) -> bytes:
     """
-    Reads a CSV file from Azure Blob Storage and returns it as a Pandas DataFrame.
+    Reads the raw content of a blob from Azure Blob Storage.
 
     Parameters:
     - blob_name: Name of the blob in Azure Storage.
@@ -55,7 +55,7 @@ def download_csv_from_blob(blob_name: str, conn_str, container_name) -> pd.DataF
     - container_name: Name of the container in Azure Storage.
 
     Returns:
-    - A Pandas DataFrame containing the CSV data.
+    - The blob content as bytes.
     """
     blob_service = BlobServiceClient.from_connection_string(conn_str)
     container_client = blob_service.get_container_client(container_name)
@@ -64,8 +64,22 @@ def download_csv_from_blob(blob_name: str, conn_str, container_name) -> pd.DataF
     if not blob_client.exists():
         raise FileNotFoundError(f"Blob {blob_name} not found.")
 
-    download_stream = blob_client.download_blob()
-    csv_data = pd.read_csv(BytesIO(download_stream.readall()))
+    return blob_client.download_blob().readall()
+
+
+def download_csv_from_blob(blob_name: str, conn_str, container_name) -> pd.DataFrame:
+    """
+    Reads a CSV file from Azure Blob Storage and returns it as a Pandas DataFrame.
+
+    Parameters:
+    - blob_name: Name of the blob in Azure Storage.
+    - conn_str: Azure Blob Storage connection string.
+    - container_name: Name of the container in Azure Storage.
+
+    Returns:
+    - A Pandas DataFrame containing the CSV data.
+    """
+    csv_data = pd.read_csv(BytesIO(download_bytes_from_blob(blob_name, conn_str, container_name)))
     print(f"Read CSV data from {blob_name}")
     return csv_data
 
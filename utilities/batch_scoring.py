@@ -0,0 +1,153 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+from utilities.instrumentation import TRACER, span
+from utilities.reason_codes import ReasonCodeEngine
+
+
+# Model (and optional reason-code engine) loaded once per worker process by the pool initializer
+_WORKER_MODEL = None
+_WORKER_REASONS = None
+# Worker-side timings not yet reported back to the parent, {name: (wall_s, cpu_s)}
+_WORKER_TIMINGS = {}
+
+
+def _init_worker(model_uri: str, n_reasons: int = 0, background_path: str = None, label_col: str = "CreditRisk"):
+    global _WORKER_MODEL, _WORKER_REASONS
+    start, cpu = time.perf_counter(), time.process_time()
+    _WORKER_MODEL = mlflow.sklearn.load_model(model_uri)
+    _WORKER_TIMINGS["model_load"] = (time.perf_counter() - start, time.process_time() - cpu)
+    if n_reasons:
+        background = None
+        if background_path:
+            background = pd.read_csv(background_path, nrows=10_000).drop(columns=[label_col], errors="ignore")
+        _WORKER_REASONS = (ReasonCodeEngine(_WORKER_MODEL, background=background), n_reasons)
+
+
+def _score_chunk(chunk: pd.DataFrame):
+    start, cpu = time.perf_counter(), time.process_time()
+    proba = _WORKER_MODEL.predict_proba(chunk)[:, 1]
+    reasons = None
+    if _WORKER_REASONS is not None:
+        engine, k = _WORKER_REASONS
+        reasons = engine.top_reasons(chunk, k=k).reset_index(drop=True)
+    _WORKER_TIMINGS["score_chunk"] = (time.perf_counter() - start, time.process_time() - cpu)
+
+    timings = dict(_WORKER_TIMINGS)
+    _WORKER_TIMINGS.clear()
+    return proba, reasons, timings
+
+
+def score_csv_in_chunks(
+    model_uri: str,
+    input_path: str,
+    output_path: str,
+    chunksize: int = 100_000,
+    n_workers: int = None,
+    id_col: str = None,
+    threshold: float = None,
+    label_col: str = "CreditRisk",
+    n_reasons: int = 0,
+    background_path: str = None,
+    drift_monitor=None
+) -> int:
+    """
+    Stream a large CSV through the model in chunks and append scores to a CSV.
+
+    Chunks are read lazily and fanned out to a process pool whose workers
+    each load the model once. At most 2 * n_workers chunks are in flight, so
+    memory stays bounded regardless of input size, and results are written
+    in input order as soon as each chunk completes.
+
+    Args:
+        model_uri (str): MLflow model URI (e.g. from best_model_pointer_file).
+        input_path (str): unlabeled input CSV (a label column, if present, is dropped).
+        output_path (str): destination CSV with row id, probability and optional decision.
+        chunksize (int): rows per chunk.
+        n_workers (int, optional): worker processes; defaults to the CPU count.
+        id_col (str, optional): column to use as stable row id; raises
+            ValueError if the input has no such column. When None, the
+            0-based row position in the input file is used as row_id.
+        threshold (float, optional): if set, also write a 0/1 decision column.
+        label_col (str): label column dropped from the features if present.
+        n_reasons (int): if > 0, append the top-n adverse-action reason codes
+            (see utilities/reason_codes.py) for every row.
+        background_path (str, optional): reference CSV (e.g. the training
+            split) defining the baseline; required for LogisticRegression champions.
+        drift_monitor (DriftMonitor, optional): updated with every chunk's
+            features and scores (see utilities/drift_monitor.py).
+
+    Returns:
+        int: number of rows scored. A header-only input writes the output
+        header and returns 0.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    reader = pd.read_csv(input_path, chunksize=chunksize)
+
+    in_flight = deque()
+    offset = 0
+    n_rows = 0
+    header = True
+
+    def _write(ids, future):
+        nonlocal header, n_rows
+        proba, reasons, timings = future.result()
+        for name, (wall_s, cpu_s) in timings.items():
+            TRACER.record(name, wall_s, cpu_s, track="workers")
+        if drift_monitor is not None:
+            drift_monitor.update(scores=proba)
+        out = pd.DataFrame({ids.name: ids.to_numpy(), "probability": proba})
+        if threshold is not None:
+            out["decision"] = (proba >= threshold).astype(int)
+        if reasons is not None:
+            out = pd.concat([out, reasons], axis=1)
+        with span("csv_write"):
+            out.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+        header = False
+        n_rows += len(out)
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(model_uri, n_reasons, background_path, label_col)) as pool:
+        while True:
+            with span("csv_parse"):
+                chunk = next(reader, None)
+            if chunk is None:
+                break
+            if id_col and id_col not in chunk.columns:
+                raise ValueError(f"id_col '{id_col}' not found in {input_path}; columns: {list(chunk.columns)}")
+            if len(chunk) == 0:
+                # A header-only file yields one empty chunk; nothing to score
+                continue
+            if id_col:
+                ids = chunk[id_col]
+                features = chunk.drop(columns=[id_col])
+            else:
+                ids = pd.Series(np.arange(offset, offset + len(chunk)), name="row_id")
+                features = chunk
+            offset += len(chunk)
+            features = features.drop(columns=[label_col], errors="ignore")
+            if drift_monitor is not None:
+                with span("drift_update"):
+                    drift_monitor.update(features)
+
+            in_flight.append((ids, pool.submit(_score_chunk, features)))
+            # Bound memory: drain the oldest chunk before reading too far ahead
+            while len(in_flight) >= 2 * n_workers:
+                _write(*in_flight.popleft())
+
+        while in_flight:
+            _write(*in_flight.popleft())
+
+    if header:
+        # Empty input: still produce a file with the expected header
+        columns = [id_col or "row_id", "probability"] + (["decision"] if threshold is not None else [])
+        columns += [f"reason_{i + 1}" for i in range(n_reasons)] + [f"contribution_{i + 1}" for i in range(n_reasons)]
+        pd.DataFrame(columns=columns).to_csv(output_path, index=False)
+
+    return n_rows
@@ -0,0 +1,223 @@
+import pandas as pd
+
+
+class DataValidationError(ValueError):
+    """
+    Raised when a dataset breaks its data contract; carries the full report.
+    """
+
+    def __init__(self, report: dict):
+        self.report = report
+        super().__init__("Data contract violated:\n  - " + "\n  - ".join(report["errors"]))
+
+
+def build_data_contract(feature_groups: dict, contract_config: dict = None) -> dict:
+    """
+    Combine feature groups with the optional data_contract.yaml settings.
+
+    Args:
+        feature_groups (dict): feature_groups.yaml content.
+        contract_config (dict, optional): data_contract.yaml content with keys
+            target_col, target_values, require_both_classes, max_null_rate,
+            null_rate_overrides, ranges, category_domains.
+
+    Returns:
+        dict: normalised contract consumed by validate_dataframe().
+    """
+    cfg = contract_config or {}
+    num_cols = list(feature_groups.get("num_cols") or [])
+    cat_cols = list(feature_groups.get("simple_cat_cols") or []) + list(feature_groups.get("complex_cat_cols") or [])
+    passthrough = list(feature_groups.get("passthrough_cols") or [])
+
+    return {
+        "num_cols": num_cols,
+        "cat_cols": cat_cols,
+        "required_cols": num_cols + cat_cols + passthrough,
+        "target_col": cfg.get("target_col", "CreditRisk"),
+        "target_values": cfg.get("target_values", [0, 1]),
+        "require_both_classes": cfg.get("require_both_classes", True),
+        "max_null_rate": cfg.get("max_null_rate", 0.0),
+        "null_rate_overrides": cfg.get("null_rate_overrides") or {},
+        "ranges": cfg.get("ranges") or {},
+        "category_domains": cfg.get("category_domains") or {},
+    }
+
+
+def _empty_stats() -> dict:
+    return {
+        "n_rows": 0,
+        "columns": None,
+        "null_counts": pd.Series(dtype=float),
+        "non_numeric": set(),
+        "non_categorical": set(),
+        "out_of_range": {},
+        "unseen": {},
+        "target_values": set(),
+    }
+
+
+def _update_stats(stats: dict, df: pd.DataFrame, contract: dict, require_target: bool):
+    """
+    Fold one frame (or chunk) into the running stats with column-wise vectorized checks.
+    """
+    if stats["columns"] is None:
+        stats["columns"] = list(df.columns)
+    stats["n_rows"] += len(df)
+
+    checked = [c for c in contract["required_cols"] if c in df.columns]
+    stats["null_counts"] = stats["null_counts"].add(df[checked].isna().sum(), fill_value=0)
+
+    num_present = [c for c in contract["num_cols"] if c in df.columns]
+    for col in num_present:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            stats["non_numeric"].add(col)
+
+    # Categorical features must hold labels (object/string/category); a numeric
+    # dtype means the column arrived label-encoded or shifted. All-null chunks
+    # read as float, so they are left to the null-rate check.
+    cat_present = [c for c in contract["cat_cols"] if c in df.columns]
+    for col in cat_present:
+        values = df[col]
+        is_label = (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)
+                    or isinstance(values.dtype, pd.CategoricalDtype))
+        if not is_label and values.notna().any():
+            stats["non_categorical"].add(col)
+
+    for col, (low, high) in contract["ranges"].items():
+        if col in df.columns and col not in stats["non_numeric"]:
+            values = df[col]
+            bad = 0
+            if low is not None:
+                bad += int((values < low).sum())
+            if high is not None:
+                bad += int((values > high).sum())
+            stats["out_of_range"][col] = stats["out_of_range"].get(col, 0) + bad
+
+    for col, domain in contract["category_domains"].items():
+        if col in df.columns:
+            values = df[col].dropna()
+            unseen = values[~values.isin(domain)].unique()
+            if len(unseen):
+                # Keep a bounded sample of offending values for the report
+                examples = stats["unseen"].setdefault(col, set())
+                examples.update(unseen[:max(0, 20 - len(examples))])
+
+    target = contract["target_col"]
+    if require_target and target in df.columns:
+        stats["target_values"].update(pd.unique(df[target].dropna()).tolist())
+
+
+def _build_report(stats: dict, contract: dict, require_target: bool, extra_columns: list) -> dict:
+    errors, warnings = [], []
+    columns = stats["columns"] or []
+    n_rows = stats["n_rows"]
+
+    missing = [c for c in contract["required_cols"] + extra_columns if c not in columns]
+    if missing:
+        errors.append(f"Missing required columns: {missing}")
+    if n_rows == 0:
+        errors.append("Dataset is empty")
+
+    if stats["non_numeric"]:
+        errors.append(f"Non-numeric dtype in num_cols: {sorted(stats['non_numeric'])}")
+    if stats["non_categorical"]:
+        errors.append(f"Non-categorical dtype in categorical cols: {sorted(stats['non_categorical'])}")
+
+    null_rates = (stats["null_counts"] / max(n_rows, 1)).to_dict()
+    for col, rate in null_rates.items():
+        limit = contract["null_rate_overrides"].get(col, contract["max_null_rate"])
+        if rate > limit:
+            errors.append(f"Null rate of '{col}' is {rate:.2%} (max {limit:.2%})")
+
+    for col, count in stats["out_of_range"].items():
+        if count:
+            low, high = contract["ranges"][col]
+            errors.append(f"{count} values of '{col}' outside [{low}, {high}]")
+
+    for col, examples in stats["unseen"].items():
+        errors.append(f"Unseen categories in '{col}': {sorted(map(str, examples))}")
+
+    target = contract["target_col"]
+    if require_target and target in columns:
+        values = stats["target_values"]
+        unexpected = values - set(contract["target_values"])
+        if unexpected:
+            errors.append(f"Target '{target}' has values outside {contract['target_values']}: {sorted(unexpected)}")
+        elif contract["require_both_classes"] and len(values) < 2:
+            errors.append(f"Target '{target}' has a single class: {sorted(values)}")
+    elif not require_target and target in columns:
+        warnings.append(f"Target column '{target}' present in unlabeled data; it will be ignored")
+
+    no_domain = [c for c in contract["cat_cols"] if c not in contract["category_domains"]]
+    if no_domain:
+        warnings.append(f"Categorical columns without a domain in the data contract (not checked): {no_domain}")
+
+    extra = [c for c in columns if c not in contract["required_cols"] + [target]]
+    if extra:
+        warnings.append(f"Columns not in feature groups (ignored by the model): {extra}")
+
+    return {
+        "ok": not errors,
+        "n_rows": n_rows,
+        "errors": errors,
+        "warnings": warnings,
+        "null_rates": {k: float(v) for k, v in null_rates.items()},
+    }
+
+
+def validate_dataframe(
+    df: pd.DataFrame,
+    contract: dict,
+    require_target: bool = True,
+    stratify_col: str = None,
+    raise_on_error: bool = True
+) -> dict:
+    """
+    Validate a DataFrame against a data contract in one pass.
+
+    Checks required columns, numeric and categorical dtypes, value ranges,
+    null rates, category domains and target cardinality, and collects every violation
+    into one consolidated report instead of stopping at the first.
+
+    Args:
+        df (pd.DataFrame): dataset to check.
+        contract (dict): output of build_data_contract().
+        require_target (bool): whether the target column must be present and binary.
+        stratify_col (str, optional): stratification column that must exist.
+        raise_on_error (bool): raise DataValidationError if any check fails.
+
+    Returns:
+        dict report with keys ok, n_rows, errors, warnings, null_rates.
+    """
+    stats = _empty_stats()
+    _update_stats(stats, df, contract, require_target)
+    return _finish(stats, contract, require_target, stratify_col, raise_on_error)
+
+
+def validate_csv_in_chunks(
+    path: str,
+    contract: dict,
+    chunksize: int = 100_000,
+    require_target: bool = True,
+    stratify_col: str = None,
+    raise_on_error: bool = True
+) -> dict:
+    """
+    Validate a CSV too large for memory by folding chunk statistics together.
+
+    Same checks and report as validate_dataframe().
+    """
+    stats = _empty_stats()
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        _update_stats(stats, chunk, contract, require_target)
+    return _finish(stats, contract, require_target, stratify_col, raise_on_error)
+
+
+def _finish(stats, contract, require_target, stratify_col, raise_on_error) -> dict:
+    extra_columns = [contract["target_col"]] if require_target else []
+    if stratify_col and stratify_col not in extra_columns:
+        extra_columns.append(stratify_col)
+    report = _build_report(stats, contract, require_target, extra_columns)
+    if raise_on_error and not report["ok"]:
+        raise DataValidationError(report)
+    return report
@@ -0,0 +1,229 @@
+import json
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+
+SCORE_FEATURE = "__score__"
+
+
+class NumericSketch:
+    """
+    Fixed-edge histogram for one numeric column.
+
+    Edges are reference quantiles (computed once); later batches only add
+    counts, so memory and update cost are O(bins) regardless of volume.
+    The outer bins are open-ended and missing values get their own bin.
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 2)  # +1 open-ended bin, +1 missing bin
+
+    @classmethod
+    def from_reference(cls, values, n_bins: int = 10) -> "NumericSketch":
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+        finite = values[~np.isnan(values)]
+        edges = np.unique(np.quantile(finite, np.linspace(0, 1, n_bins + 1)[1:-1])) if finite.size else np.array([])
+        sketch = cls(edges)
+        sketch.update(values)
+        return sketch
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=float)
+        missing = np.isnan(values)
+        bins = np.searchsorted(self.edges, values[~missing], side="right")
+        self.counts[:-1] += np.bincount(bins, minlength=len(self.edges) + 1)
+        self.counts[-1] += missing.sum()
+
+    def new_empty(self) -> "NumericSketch":
+        return NumericSketch(self.edges)
+
+    def to_dict(self) -> dict:
+        return {"type": "numeric", "edges": self.edges.tolist(), "counts": self.counts.tolist()}
+
+
+class CategoricalSketch:
+    """
+    Category frequency table for one categorical column.
+
+    The domain is fixed from the reference; unseen categories are pooled into
+    a single "other" bucket and missing values into their own bucket.
+    """
+
+    def __init__(self, categories: list):
+        self.categories = list(categories)
+        self._index = pd.Index(self.categories)
+        self.counts = np.zeros(len(self.categories) + 2)  # +1 other, +1 missing
+
+    @classmethod
+    def from_reference(cls, values, max_categories: int = 100) -> "CategoricalSketch":
+        top = pd.Series(values).dropna().astype(str).value_counts().index[:max_categories]
+        sketch = cls(list(top))
+        sketch.update(values)
+        return sketch
+
+    def update(self, values):
+        values = pd.Series(values)
+        missing = values.isna().to_numpy()
+        codes = self._index.get_indexer(values[~missing].astype(str))
+        codes[codes < 0] = len(self.categories)
+        self.counts[:-1] += np.bincount(codes, minlength=len(self.categories) + 1)
+        self.counts[-1] += missing.sum()
+
+    def new_empty(self) -> "CategoricalSketch":
+        return CategoricalSketch(self.categories)
+
+    def to_dict(self) -> dict:
+        return {"type": "categorical", "categories": self.categories, "counts": self.counts.tolist()}
+
+
+def population_stability_index(expected_counts, actual_counts, eps: float = 1e-4) -> float:
+    """
+    PSI between two histograms over the same bins (O(bins)).
+    """
+    expected = np.asarray(expected_counts, dtype=float)
+    actual = np.asarray(actual_counts, dtype=float)
+    e = np.clip(expected / max(expected.sum(), 1.0), eps, None)
+    a = np.clip(actual / max(actual.sum(), 1.0), eps, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def binned_ks(expected_counts, actual_counts) -> float:
+    """
+    Kolmogorov-Smirnov statistic between two histograms over the same ordered bins.
+
+    This is the KS distance evaluated at the bin edges, i.e. a lower bound of
+    the exact two-sample KS that needs no raw data.
+    """
+    expected = np.asarray(expected_counts, dtype=float)
+    actual = np.asarray(actual_counts, dtype=float)
+    e = np.cumsum(expected) / max(expected.sum(), 1.0)
+    a = np.cumsum(actual) / max(actual.sum(), 1.0)
+    return float(np.max(np.abs(e - a)))
+
+
+class DriftMonitor:
+    """
+    Streaming feature- and score-drift monitor built from reference sketches.
+
+    Reference sketches are built once from the training split (quantile bins
+    for num_cols, category frequencies for simple_cat_cols/complex_cat_cols,
+    plus the model score). Production sketches share the same bins and are
+    updated batch by batch, so no raw rows are retained.
+
+    Args:
+        reference (dict): {column: NumericSketch | CategoricalSketch}, as
+            built by from_training().
+    """
+
+    def __init__(self, reference: dict):
+        self.reference = reference
+        self.current = {col: sketch.new_empty() for col, sketch in reference.items()}
+
+    @classmethod
+    def from_training(
+        cls,
+        train_df: pd.DataFrame,
+        feature_groups: dict,
+        reference_scores=None,
+        n_bins: int = 10
+    ) -> "DriftMonitor":
+        """
+        Build reference sketches from the preprocess step's training split.
+
+        Args:
+            train_df (pd.DataFrame): training split.
+            feature_groups (dict): feature_groups.yaml content.
+            reference_scores (array-like, optional): model probabilities on the
+                training split, to monitor score drift as well.
+            n_bins (int): quantile bins for numeric columns.
+        """
+        reference = {}
+        for col in feature_groups.get("num_cols", []):
+            reference[col] = NumericSketch.from_reference(train_df[col], n_bins=n_bins)
+        for col in feature_groups.get("simple_cat_cols", []) + feature_groups.get("complex_cat_cols", []):
+            reference[col] = CategoricalSketch.from_reference(train_df[col])
+        if reference_scores is not None:
+            reference[SCORE_FEATURE] = NumericSketch.from_reference(reference_scores, n_bins=n_bins)
+        return cls(reference)
+
+    def update(self, batch_df: pd.DataFrame = None, scores=None):
+        """
+        Add a scoring batch's features and/or probabilities to the production sketches.
+        """
+        for col, sketch in self.current.items():
+            if col == SCORE_FEATURE:
+                if scores is not None:
+                    sketch.update(scores)
+            elif batch_df is not None and col in batch_df.columns:
+                sketch.update(batch_df[col])
+
+    def reset(self):
+        self.current = {col: sketch.new_empty() for col, sketch in self.reference.items()}
+
+    def compute(self) -> pd.DataFrame:
+        """
+        PSI and binned KS per monitored feature (and the score).
+
+        KS is only reported for numeric sketches, where bins are ordered;
+        features with no production rows yet are reported as NaN.
+
+        Returns:
+            pd.DataFrame indexed by feature with columns psi, ks and n_rows.
+        """
+        rows = []
+        for col, ref in self.reference.items():
+            cur = self.current[col]
+            observed = cur.counts.sum() > 0
+            rows.append({
+                "feature": col,
+                "psi": population_stability_index(ref.counts, cur.counts) if observed else np.nan,
+                "ks": binned_ks(ref.counts[:-1], cur.counts[:-1])
+                if observed and isinstance(ref, NumericSketch) else np.nan,
+                "n_rows": int(cur.counts.sum()),
+            })
+        return pd.DataFrame(rows).set_index("feature")
+
+    def log_to_mlflow(self, prefix: str = "drift", step: int = None) -> pd.DataFrame:
+        """
+        Log PSI/KS per feature as MLflow metrics (e.g. drift_psi_Duration).
+
+        Call inside an active MLflow run.
+        """
+        report = self.compute()
+        metrics = {}
+        for feature, row in report.iterrows():
+            name = "score" if feature == SCORE_FEATURE else feature
+            if not np.isnan(row["psi"]):
+                metrics[f"{prefix}_psi_{name}"] = row["psi"]
+            if not np.isnan(row["ks"]):
+                metrics[f"{prefix}_ks_{name}"] = row["ks"]
+        mlflow.log_metrics(metrics, step=step)
+        return report
+
+    def reference_dict(self) -> dict:
+        return {col: sketch.to_dict() for col, sketch in self.reference.items()}
+
+    def save_reference(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.reference_dict(), f, indent=2)
+
+    @classmethod
+    def load_reference(cls, path: str) -> "DriftMonitor":
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls.from_reference_dict(data)
+
+    @classmethod
+    def from_reference_dict(cls, data: dict) -> "DriftMonitor":
+        reference = {}
+        for col, spec in data.items():
+            if spec["type"] == "numeric":
+                sketch = NumericSketch(np.asarray(spec["edges"]))
+            else:
+                sketch = CategoricalSketch(spec["categories"])
+            sketch.counts = np.asarray(spec["counts"], dtype=float)
+            reference[col] = sketch
+        return cls(reference)
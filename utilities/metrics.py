@@ -0,0 +1,337 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from scipy.stats import rankdata
+
+
+def rank_auc(y_true, y_proba):
+    """
+    Compute ROC AUC from ranks (Mann-Whitney U), vectorized over candidates.
+
+    Args:
+        y_true (array-like): binary labels, shape (n_samples,).
+        y_proba (array-like): scores, shape (n_samples,) or (n_candidates, n_samples).
+
+    Returns:
+        float or np.ndarray: AUC per candidate (scalar for 1-D input).
+    """
+    y = np.asarray(y_true).astype(bool)
+    proba = np.atleast_2d(np.asarray(y_proba, dtype=float))
+
+    n_pos = y.sum()
+    n_neg = y.size - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("AUC is undefined when only one class is present in y_true")
+
+    ranks = rankdata(proba, axis=1)
+    auc = (ranks[:, y].sum(axis=1) - n_pos * (n_pos + 1) / 2) / (n_pos * n_neg)
+    return auc if np.ndim(y_proba) > 1 else float(auc[0])
+
+
+def binary_classification_metrics(y_true, y_proba, threshold: float = 0.5) -> dict:
+    """
+    Compute the evaluation metric set in one vectorized pass.
+
+    Returns the same keys as score_on_test: auc_roc, accuracy, precision,
+    recall, f1 and brier_score. Precision/F1 are 0.0 when undefined,
+    matching sklearn's zero_division default.
+
+    Args:
+        y_true (array-like): binary labels, shape (n_samples,).
+        y_proba (array-like): positive-class probabilities, shape (n_samples,)
+            or (n_candidates, n_samples) to score several models at once.
+        threshold (float): decision threshold for the positive class.
+
+    Returns:
+        dict {metric_name: float} for 1-D input, or
+        dict {metric_name: np.ndarray of shape (n_candidates,)} for 2-D input.
+    """
+    y = np.asarray(y_true).astype(bool)
+    proba = np.atleast_2d(np.asarray(y_proba, dtype=float))
+
+    y_pred = proba >= threshold
+    tp = (y_pred & y).sum(axis=1)
+    fp = (y_pred & ~y).sum(axis=1)
+    fn = (~y_pred & y).sum(axis=1)
+    tn = y.size - tp - fp - fn
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+
+    metrics = {
+        "auc_roc": np.atleast_1d(rank_auc(y, proba)),
+        "accuracy": (tp + tn) / y.size,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "brier_score": ((proba - y) ** 2).mean(axis=1),
+    }
+
+    if np.ndim(y_proba) > 1:
+        return metrics
+    return {k: float(v[0]) for k, v in metrics.items()}
+
+
+def threshold_curve(
+    y_true,
+    y_proba,
+    thresholds=None,
+    cost_fp: float = 1.0,
+    cost_fn: float = 5.0
+) -> pd.DataFrame:
+    """
+    Compute confusion counts and threshold metrics at every candidate threshold.
+
+    The probabilities are sorted once; positives/negatives at or above each
+    threshold are read off a cumulative sum, so the whole curve costs one
+    sort plus a binary search per threshold. Predictions follow the same rule
+    as the rest of the pipeline: positive when proba >= threshold.
+
+    Args:
+        y_true (array-like): binary labels, shape (n_samples,).
+        y_proba (array-like): positive-class probabilities, shape (n_samples,).
+        thresholds (array-like, optional): thresholds to evaluate. Defaults to
+            a 0.00-1.00 grid in 0.01 steps; pass "all" for every distinct score.
+        cost_fp (float): cost of flagging a good applicant (false positive).
+        cost_fn (float): cost of missing a defaulter (false negative). The 1:5
+            default follows the German Credit cost matrix.
+
+    Returns:
+        pd.DataFrame with columns threshold, tp, fp, fn, tn, precision, recall,
+        f1 and expected_cost (average cost per applicant).
+    """
+    y = np.asarray(y_true).astype(bool)
+    proba = np.asarray(y_proba, dtype=float)
+
+    order = np.argsort(proba, kind="mergesort")
+    p_sorted = proba[order]
+    pos_below = np.r_[0, np.cumsum(y[order])]  # positives among the k lowest scores
+
+    if thresholds is None:
+        thresholds = np.round(np.linspace(0.0, 1.0, 101), 2)
+    elif isinstance(thresholds, str) and thresholds == "all":
+        thresholds = np.unique(p_sorted)
+    thresholds = np.asarray(thresholds, dtype=float)
+
+    n, n_pos = y.size, pos_below[-1]
+    k = np.searchsorted(p_sorted, thresholds, side="left")  # rows predicted negative
+    tp = n_pos - pos_below[k]
+    fp = (n - k) - tp
+    fn = n_pos - tp
+    tn = n - tp - fp - fn
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(n_pos > 0, tp / max(n_pos, 1), 0.0)
+        f1 = np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+
+    return pd.DataFrame({
+        "threshold": thresholds,
+        "tp": tp, "fp": fp, "fn": fn, "tn": tn,
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "expected_cost": (cost_fp * fp + cost_fn * fn) / n,
+    })
+
+
+BOOTSTRAP_METRICS = ("auc_roc", "accuracy", "precision", "recall", "f1", "brier_score")
+
+# Shared state for bootstrap worker processes (set once per worker by the pool initializer)
+_BOOTSTRAP_STATE = {}
+
+
+def _bootstrap_init(y_true, y_proba, threshold):
+    y = np.asarray(y_true).astype(bool)
+    proba = np.atleast_2d(np.asarray(y_proba, dtype=float))
+
+    # Resample counts are exchangeable across rows, so they are drawn directly
+    # per position of the first candidate's sorted order: that candidate
+    # needs no gather and the others one uint16 gather through `perm`
+    ref_order = np.argsort(proba[0], kind="mergesort")
+    ref_position = np.empty_like(ref_order)
+    ref_position[ref_order] = np.arange(y.size)
+    y_ref = y[ref_order]
+
+    candidates, static = [], []
+    for i, p in enumerate(proba):
+        order = ref_order if i == 0 else np.argsort(p, kind="mergesort")
+        p_sorted = p[order]
+        y_sorted = y[order]
+        # Tie group bounds per sorted position: [group_start, group_end)
+        starts = np.r_[True, p_sorted[1:] != p_sorted[:-1]]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(y.size), 0))
+        group_end = np.r_[np.flatnonzero(starts)[1:], y.size][np.cumsum(starts) - 1]
+        pos_idx = np.flatnonzero(y_sorted)
+        candidates.append({
+            "perm": None if i == 0 else ref_position[order],
+            "neg": ~y_sorted,
+            "pos_idx": pos_idx,
+            "below": group_start[pos_idx],
+            # None without ties: negatives below and up to a positive then coincide
+            "up_to": group_end[pos_idx] if not starts.all() else None,
+        })
+        pred = p[ref_order] >= threshold
+        static += [pred & y_ref, pred & ~y_ref, ~pred & y_ref, (p[ref_order] - y_ref) ** 2]
+
+    # One matrix product of the counts gives tp, fp, fn and squared error sums of every candidate
+    _BOOTSTRAP_STATE.update(n=y.size, candidates=candidates, static=np.column_stack(static).astype(float))
+
+
+def _bootstrap_chunk(n_resamples, seed):
+    n = _BOOTSTRAP_STATE["n"]
+    rng = np.random.default_rng(seed)
+
+    # Per-position resampling counts; a count above 65535 has negligible probability
+    idx = rng.integers(0, n, size=(n_resamples, n))
+    weights = np.empty((n_resamples, n), dtype=np.uint16)
+    for r in range(n_resamples):
+        weights[r] = np.bincount(idx[r], minlength=n)
+    del idx
+
+    sums = (weights @ _BOOTSTRAP_STATE["static"]).T.reshape(-1, 4, n_resamples)
+    # Cumulative negative counts never exceed the n resampled rows
+    cum_neg = np.zeros((n_resamples, n + 1), dtype=np.int64 if n >= 2 ** 31 else np.int32)
+
+    out = {m: [] for m in BOOTSTRAP_METRICS}
+    for cand, (tp, fp, fn, sq_err) in zip(_BOOTSTRAP_STATE["candidates"], sums):
+        w_sorted = weights if cand["perm"] is None else weights[:, cand["perm"]]
+
+        # Weighted rank AUC from integer cumsums of the negatives in sorted order:
+        # each positive beats the negatives below its tie group, ties count half
+        np.cumsum(w_sorted * cand["neg"], axis=1, out=cum_neg[:, 1:])
+        w_pos = w_sorted[:, cand["pos_idx"]].astype(float)
+        below = cum_neg[:, cand["below"]]
+        if cand["up_to"] is None:
+            wins2 = 2 * np.einsum("ij,ij->i", w_pos, below)
+        else:
+            wins2 = np.einsum("ij,ij->i", w_pos, below + cum_neg[:, cand["up_to"]].astype(np.int64))
+        n_pos, n_neg = w_pos.sum(axis=1), cum_neg[:, -1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            auc = wins2 / (2.0 * n_pos * n_neg)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["precision"].append(np.where(tp + fp > 0, tp / (tp + fp), 0.0))
+            out["recall"].append(np.where(tp + fn > 0, tp / (tp + fn), 0.0))
+            out["f1"].append(np.where(2 * tp + fp + fn > 0, 2 * tp / (2 * tp + fp + fn), 0.0))
+        out["auc_roc"].append(auc)
+        out["accuracy"].append((n - fp - fn) / n)
+        out["brier_score"].append(sq_err / n)
+
+    return {m: np.vstack(v) for m, v in out.items()}
+
+
+def bootstrap_metrics(
+    y_true,
+    y_proba,
+    threshold: float = 0.5,
+    n_resamples: int = 1000,
+    chunk_size: int = None,
+    n_jobs: int = 1,
+    random_state: int = 42
+) -> dict:
+    """
+    Bootstrap the evaluation metric set for one or more candidates.
+
+    Resamples are drawn as index matrices and turned into uint16 row counts,
+    once per chunk and shared by every candidate, so all candidates are
+    scored on exactly the same resamples (paired). Counts are drawn in the
+    first candidate's sorted order; AUC is then the weighted positives times
+    the integer cumsum of the negatives below them in each candidate's
+    pre-sorted order, and threshold/Brier metrics of all candidates come from
+    one matrix product; sklearn is never called inside the loop. Resamples are processed in
+    chunks, optionally across a process pool. Results are deterministic for a
+    given random_state and chunk_size, whatever n_jobs is.
+
+    Args:
+        y_true (array-like): binary labels, shape (n_samples,).
+        y_proba (array-like): probabilities, shape (n_samples,) or (n_candidates, n_samples).
+        threshold (float): decision threshold for precision/recall/F1/accuracy.
+        n_resamples (int): number of bootstrap resamples.
+        chunk_size (int, optional): resamples per chunk; defaults to keeping
+            each chunk around 2**22 weights.
+        n_jobs (int): number of worker processes (1 = in-process, -1 = all cores).
+        random_state (int): seed for the resampling streams.
+
+    Returns:
+        dict {metric_name: np.ndarray of shape (n_candidates, n_resamples)}.
+    """
+    n = len(y_true)
+    if chunk_size is None:
+        chunk_size = max(1, min(n_resamples, (1 << 22) // max(n, 1)))
+
+    sizes = [chunk_size] * (n_resamples // chunk_size)
+    if n_resamples % chunk_size:
+        sizes.append(n_resamples % chunk_size)
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+
+    if n_jobs == 1:
+        _bootstrap_init(y_true, y_proba, threshold)
+        chunks = [_bootstrap_chunk(size, seed) for size, seed in zip(sizes, seeds)]
+    else:
+        max_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_bootstrap_init,
+            initargs=(y_true, y_proba, threshold)
+        ) as pool:
+            chunks = list(pool.map(_bootstrap_chunk, sizes, seeds))
+
+    return {m: np.hstack([c[m] for c in chunks]) for m in BOOTSTRAP_METRICS}
+
+
+def bootstrap_summary(samples: dict, names: list, alpha: float = 0.05, reference: int = 0) -> dict:
+    """
+    Summarise bootstrap samples into percentile confidence intervals and
+    paired-difference tests against a reference candidate.
+
+    Args:
+        samples (dict): output of bootstrap_metrics().
+        names (list[str]): candidate names, in the same order as y_proba rows.
+        alpha (float): two-sided significance level (0.05 -> 95% intervals).
+        reference (int): index of the reference candidate (e.g. the champion).
+
+    Returns:
+        dict with:
+            - intervals: {name: {metric: {mean, lower, upper}}}
+            - paired_differences: {"<name> - <reference>": {metric: {mean_diff, lower, upper, p_value}}}
+    """
+    q = [100 * alpha / 2, 100 * (1 - alpha / 2)]
+    summary = {"alpha": alpha, "reference": names[reference], "intervals": {}, "paired_differences": {}}
+
+    for i, name in enumerate(names):
+        summary["intervals"][name] = {}
+        for metric, values in samples.items():
+            mean, lower, upper = _percentile_interval(values[i], q)
+            summary["intervals"][name][metric] = {"mean": mean, "lower": lower, "upper": upper}
+
+        if i == reference:
+            continue
+        key = f"{name} - {names[reference]}"
+        summary["paired_differences"][key] = {}
+        for metric, values in samples.items():
+            diff = values[i] - values[reference]
+            diff = diff[~np.isnan(diff)]
+            mean_diff, lower, upper = _percentile_interval(diff, q)
+            # Two-sided bootstrap p-value for H0: no difference
+            p_value = min(1.0, 2 * min(np.mean(diff <= 0), np.mean(diff >= 0))) if diff.size else np.nan
+            summary["paired_differences"][key][metric] = {
+                "mean_diff": mean_diff, "lower": lower, "upper": upper, "p_value": float(p_value)
+            }
+
+    return summary
+
+
+def _percentile_interval(values: np.ndarray, q: list) -> tuple[float, float, float]:
+    """
+    (mean, lower, upper) of the non-NaN values; all NaN when no resample was
+    defined (e.g. AUC on resamples holding a single class).
+    """
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return np.nan, np.nan, np.nan
+    lower, upper = np.percentile(values, q)
+    return float(values.mean()), float(lower), float(upper)
@@ -2,10 +2,11 @@ from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from category_encoders import TargetEncoder
 import pandas as pd
+import yaml
 from sklearn.model_selection import train_test_split
 from importlib import import_module
+from utilities.target_encoding import OutOfFoldTargetEncoder
 
 
 def build_preprocessor(feature_groups: dict):
@@ -38,7 +39,7 @@ def build_preprocessor(feature_groups: dict):
 
     complex_cat_pipeline = Pipeline([
         ('imputer', SimpleImputer(strategy='most_frequent')),
-        ('encode', TargetEncoder())
+        ('encode', OutOfFoldTargetEncoder())
     ])
 
     return ColumnTransformer([
@@ -48,18 +49,18 @@ def build_preprocessor(feature_groups: dict):
     ])
 
 
-def run_preprocessing_df(
+def clean_dataframe(
     df: pd.DataFrame,
     dropna_cols=None,
     drop_duplicates=True,
     rename_map=None,
-    dtype_map=None,
-    test_size: float = 0.2,
-    random_state: int = 42,
-    stratify_col: str = "target"
-) -> tuple[pd.DataFrame, pd.DataFrame]:
+    dtype_map=None
+) -> pd.DataFrame:
     """
-    Apply preprocessing to an in-memory DataFrame and split into train/test sets.
+    Apply the preprocess hygiene steps (drop NAs, drop duplicates, rename, cast).
+
+    This is the frame the model actually sees, so data contract validation
+    runs on its output rather than on the raw input.
 
     Args:
         df (pd.DataFrame): Input dataset.
@@ -67,16 +68,10 @@ def run_preprocessing_df(
         drop_duplicates (bool): Whether to drop duplicates.
         rename_map (dict, optional): Dict for renaming columns.
         dtype_map (dict, optional): Dict for casting dtypes.
-        test_size (float): Proportion for test split.
-        random_state (int): Seed for reproducibility.
-        stratify_col (str): Column name to stratify on (e.g., "target").
 
     Returns:
-        train_df (pd.DataFrame): Preprocessed training set.
-        test_df (pd.DataFrame): Preprocessed test set.
+        pd.DataFrame: cleaned dataset.
     """
-
-    # --- Cleaning ---
     if dropna_cols:
         df = df.dropna(subset=dropna_cols)
 
@@ -89,7 +84,28 @@ def run_preprocessing_df(
     if dtype_map:
         df = df.astype(dtype_map)
 
-    # --- Splitting ---
+    return df
+
+
+def split_dataframe(
+    df: pd.DataFrame,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    stratify_col: str = "target"
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Split a cleaned DataFrame into train/test sets, stratified when the column exists.
+
+    Args:
+        df (pd.DataFrame): Cleaned dataset.
+        test_size (float): Proportion for test split.
+        random_state (int): Seed for reproducibility.
+        stratify_col (str): Column name to stratify on (e.g., "target").
+
+    Returns:
+        train_df (pd.DataFrame): Training set.
+        test_df (pd.DataFrame): Test set.
+    """
     stratify_vals = df[stratify_col] if stratify_col and stratify_col in df.columns else None
 
     train_df, test_df = train_test_split(
@@ -102,6 +118,48 @@ def run_preprocessing_df(
     return train_df, test_df
 
 
+def run_preprocessing_df(
+    df: pd.DataFrame,
+    dropna_cols=None,
+    drop_duplicates=True,
+    rename_map=None,
+    dtype_map=None,
+    test_size: float = 0.2,
+    random_state: int = 42,
+    stratify_col: str = "target"
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Apply preprocessing to an in-memory DataFrame and split into train/test sets.
+
+    Args:
+        df (pd.DataFrame): Input dataset.
+        dropna_cols (list[str], optional): Columns on which to drop NA rows.
+        drop_duplicates (bool): Whether to drop duplicates.
+        rename_map (dict, optional): Dict for renaming columns.
+        dtype_map (dict, optional): Dict for casting dtypes.
+        test_size (float): Proportion for test split.
+        random_state (int): Seed for reproducibility.
+        stratify_col (str): Column name to stratify on (e.g., "target").
+
+    Returns:
+        train_df (pd.DataFrame): Preprocessed training set.
+        test_df (pd.DataFrame): Preprocessed test set.
+    """
+    df = clean_dataframe(df, dropna_cols, drop_duplicates, rename_map, dtype_map)
+    return split_dataframe(df, test_size, random_state, stratify_col)
+
+
+def load_decision_threshold(training_config_path: str = "./configs/training_config.yaml") -> float:
+    """
+    Read the decision threshold (probability of default cutoff) from
+    training_config.yaml global_hyperparams, the single source every
+    component, runner and the scoring service take it from.
+    """
+    with open(training_config_path, "r") as f:
+        training_config = yaml.safe_load(f)
+    return float(training_config["global_hyperparams"]["decision_threshold"])
+
+
 def load_model(class_path: str, params: dict):
     """
     Dynamically import and instantiate a model class from its string path.
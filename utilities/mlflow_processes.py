@@ -1,12 +1,20 @@
+import json
 import mlflow
 import numpy as np
+import pandas as pd
+import joblib
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import cross_validate
+from sklearn.pipeline import Pipeline
 from sklearn.metrics import (
-    roc_auc_score, precision_score, accuracy_score, recall_score, f1_score,
-    brier_score_loss, log_loss
+    precision_score, recall_score, f1_score, brier_score_loss, log_loss
 )
 import os
 
+from utilities.metrics import binary_classification_metrics, threshold_curve
+from utilities.drift_monitor import DriftMonitor
+from utilities.instrumentation import TRACER, span
+
 
 def train_and_register_model(
         name: str,
@@ -15,28 +23,42 @@ def train_and_register_model(
         params: dict = None,
         tags: dict = None,
         cv_folds: int = 5,
-        threshold: float = 0.5
+        threshold: float = 0.5,
+        feature_groups: dict = None
 ):
     """
     Train a candidate pipeline, log metrics and params to MLflow,
     and register the model in the MLflow/AML registry.
 
     Workflow:
-      - Cross-validation for selection metrics (AUC-ROC primarily)
+      - Cross-validation for selection metrics (AUC-ROC primarily) and
+        out-of-fold scores of the training rows
       - Final fit for calibration + threshold-based metrics
+      - Drift reference sketches of the training data and of the
+        out-of-fold scores (when feature_groups is given)
+
+    Returns:
+        dict: candidate entry (name, version, run_id, model_uri, metrics) in the
+        same shape as get_candidates_for_current_run().
     """
-    with mlflow.start_run():
+    with mlflow.start_run() as run:
         metrics = {}
 
         # --- 1. Cross-validation for selection metrics ---
         scoring = {"auc": "roc_auc"}  # we keep AUC as primary
-        cv_results = cross_validate(
-            pipeline, X_train, y_train,
-            cv=cv_folds,
-            scoring=scoring,
-            return_train_score=False,
-            n_jobs=-1
-        )
+        with span("cross_validate", model=name, folds=cv_folds):
+            cv_results = cross_validate(
+                pipeline, X_train, y_train,
+                cv=cv_folds,
+                scoring=scoring,
+                return_train_score=False,
+                return_estimator=True,
+                return_indices=True,
+                n_jobs=-1
+            )
+            # Folds run in worker processes; record their own fit/score times
+            for i, (fit_s, score_s) in enumerate(zip(cv_results["fit_time"], cv_results["score_time"])):
+                TRACER.record("cv_fold", fit_s + score_s, track=f"cv_fold_{i}", fit_s=fit_s, score_s=score_s)
 
         auc_mean = np.mean(cv_results["test_auc"])
         auc_std = np.std(cv_results["test_auc"])
@@ -44,12 +66,22 @@ def train_and_register_model(
         mlflow.log_metric("cv_auc_std", auc_std)
         metrics["cv_auc_mean"] = auc_mean
         metrics["cv_auc_std"] = auc_std
+        # selection_criteria ranks candidates on auc_roc; expose the CV estimate under that key
+        mlflow.log_metric("auc_roc", auc_mean)
+        metrics["auc_roc"] = auc_mean
+
+        # Each row scored by the fold model that did not see it: unlike the
+        # final model's in-sample scores, these look like production scores
+        with span("predict_out_of_fold", model=name):
+            y_oof = out_of_fold_proba(cv_results, X_train)
 
         # --- 2. Final fit for calibration + threshold metrics ---
-        pipeline.fit(X_train, y_train)
+        with span("final_fit", model=name):
+            pipeline.fit(X_train, y_train)
 
         try:
-            y_proba = pipeline.predict_proba(X_train)[:, 1]
+            with span("predict_train", model=name):
+                y_proba = pipeline.predict_proba(X_train)[:, 1]
 
             # Calibration metrics
             brier = brier_score_loss(y_train, y_proba)
@@ -65,13 +97,25 @@ def train_and_register_model(
             recall = recall_score(y_train, y_pred, pos_label=1)
             f1 = f1_score(y_train, y_pred, pos_label=1)
 
-            mlflow.log_metric(f"precision_pos@{threshold}", precision)
-            mlflow.log_metric(f"recall_pos@{threshold}", recall)
-            mlflow.log_metric(f"f1_pos@{threshold}", f1)
+            mlflow.log_metric(f"precision_pos_at_{threshold}", precision)
+            mlflow.log_metric(f"recall_pos_at_{threshold}", recall)
+            mlflow.log_metric(f"f1_pos_at_{threshold}", f1)
+
+            metrics[f"precision_pos_at_{threshold}"] = precision
+            metrics[f"recall_pos_at_{threshold}"] = recall
+            metrics[f"f1_pos_at_{threshold}"] = f1
 
-            metrics[f"precision_pos@{threshold}"] = precision
-            metrics[f"recall_pos@{threshold}"] = recall
-            metrics[f"f1_pos@{threshold}"] = f1
+            # Full threshold curve so the policy threshold can be picked without retraining;
+            # out-of-fold scores, since in-sample ones overstate precision at every cutoff
+            with span("threshold_curve"):
+                curve = threshold_curve(y_train, y_oof)
+                mlflow.log_text(curve.to_csv(index=False, float_format="%.6g"), "threshold_curve.csv")
+
+            # Reference sketches for production drift monitoring
+            if feature_groups:
+                with span("drift_reference"):
+                    monitor = DriftMonitor.from_training(X_train, feature_groups, reference_scores=y_oof)
+                    mlflow.log_dict(monitor.reference_dict(), "drift_reference.json")
 
         except AttributeError:
             metrics["brier_score"] = None
@@ -85,11 +129,29 @@ def train_and_register_model(
             mlflow.set_tags(tags)
 
         # --- 4. Register model ---
-        mlflow.sklearn.log_model(
-            sk_model=pipeline,
-            artifact_path=name,
-            registered_model_name=f"credit_model_{name}"
-        )
+        registered_name = f"credit_model_{name}"
+        with span("register_model", model=name):
+            model_info = mlflow.sklearn.log_model(
+                sk_model=pipeline,
+                artifact_path=name,
+                registered_model_name=registered_name
+            )
+
+            # Tag the version so get_candidates_for_current_run() can find it
+            version = model_info.registered_model_version
+            client = mlflow.tracking.MlflowClient()
+            client.set_model_version_tag(registered_name, version, "candidate", "True")
+            parent_run_id = os.environ.get("AZUREML_PARENT_RUN_ID")
+            if parent_run_id:
+                client.set_model_version_tag(registered_name, version, "pipeline_run_id", parent_run_id)
+
+        return {
+            "name": registered_name,
+            "version": version,
+            "run_id": run.info.run_id,
+            "model_uri": f"models:/{registered_name}/{version}",
+            "metrics": metrics,
+        }
 
 
 def get_candidates_for_current_run():
@@ -116,26 +178,175 @@ def get_candidates_for_current_run():
     return all_models
 
 
-def score_on_test(model_uri, test_df, threshold=0.5):
+def write_candidates_manifest(candidates: list, path: str):
+    """
+    Write registered candidates (as returned by train_and_register_model) to a JSON manifest.
+    """
+    with open(path, "w") as f:
+        json.dump(candidates, f, indent=2, default=float)
+
+
+def load_candidates_manifest(path: str) -> list:
+    """
+    Read a candidates manifest written by the train component.
+
+    Unlike get_candidates_for_current_run(), this does not depend on the
+    current pipeline run id, so it also works when the train step was
+    reused from an earlier run.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def out_of_fold_proba(cv_results: dict, X) -> np.ndarray:
+    """
+    Positive-class probability of every row from the CV model of the fold
+    that held it out.
+
+    Args:
+        cv_results (dict): cross_validate() output with return_estimator=True
+            and return_indices=True.
+        X (pd.DataFrame | np.ndarray): the features cross_validate() was run on.
+
+    Returns:
+        np.ndarray of length len(X), or None if the estimators have no predict_proba.
+    """
+    proba = np.full(len(X), np.nan)
+    for estimator, rows in zip(cv_results["estimator"], cv_results["indices"]["test"]):
+        if not hasattr(estimator, "predict_proba"):
+            return None
+        X_fold = X.iloc[rows] if hasattr(X, "iloc") else X[rows]
+        proba[rows] = estimator.predict_proba(X_fold)[:, 1]
+    return proba
+
+
+def read_model_pointer(pointer_file: str) -> str:
+    """
+    Read the model URI written by the evaluate component's best_model_pointer_file.
+    """
+    with open(pointer_file, "r") as f:
+        model_uri = f.read().strip()
+    if not model_uri:
+        raise ValueError(f"Model pointer file {pointer_file} is empty")
+    return model_uri
+
+
+def load_drift_reference(model_uri: str) -> DriftMonitor:
+    """
+    Load the drift reference sketches logged next to a registered model
+    (see train_and_register_model) and return a fresh DriftMonitor.
+    """
+    if model_uri.startswith("models:/"):
+        name, version = model_uri[len("models:/"):].split("/", 1)
+        run_id = mlflow.tracking.MlflowClient().get_model_version(name, version).run_id
+        artifact_uri = f"runs:/{run_id}/drift_reference.json"
+    else:
+        artifact_uri = model_uri.rsplit("/", 1)[0] + "/drift_reference.json"
+    return DriftMonitor.from_reference_dict(mlflow.artifacts.load_dict(artifact_uri))
+
+
+def score_on_test(model_uri, test_df, threshold=0.5, return_proba=False):
     """
     Load model from MLflow registry and score it on test set.
+
+    When return_proba is True, returns (metrics, y_proba).
     """
-    model = mlflow.sklearn.load_model(model_uri)
+    with span("model_load"):
+        model = mlflow.sklearn.load_model(model_uri)
 
     X_test = test_df.drop(columns=["CreditRisk"])
     y_test = test_df["CreditRisk"]
 
     # Predict
-    y_proba = model.predict_proba(X_test)[:, 1]
-    y_pred = (y_proba >= threshold).astype(int)
+    with span("predict", rows=len(X_test)):
+        y_proba = model.predict_proba(X_test)[:, 1]
 
     # Metrics
-    metrics = {
-        "auc_roc": roc_auc_score(y_test, y_proba),
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision": precision_score(y_test, y_pred),
-        "recall": recall_score(y_test, y_pred),
-        "f1": f1_score(y_test, y_pred),
-        "brier_score": brier_score_loss(y_test, y_proba),
-    }
+    with span("metrics"):
+        metrics = binary_classification_metrics(y_test, y_proba, threshold=threshold)
+    if return_proba:
+        return metrics, y_proba
     return metrics
+
+
+def predict_candidates_proba(models: list, X) -> np.ndarray:
+    """
+    Predict positive-class probabilities for several fitted models at once.
+
+    Pipelines whose fitted preprocessors are identical (same content hash,
+    which is the case for candidates trained in the same pipeline run) share
+    a single transformed matrix, so the ColumnTransformer runs once per
+    distinct preprocessor instead of once per model. Transforms and
+    estimator predictions run concurrently in a thread pool.
+
+    Args:
+        models (list): fitted sklearn Pipelines (or bare estimators).
+        X (pd.DataFrame): raw feature frame.
+
+    Returns:
+        np.ndarray of shape (n_models, n_samples).
+    """
+    # Group models by fitted preprocessor content
+    prep_keys, preprocessors = [], {}
+    for model in models:
+        if isinstance(model, Pipeline) and len(model.steps) > 1:
+            key = joblib.hash(model[:-1])
+            preprocessors.setdefault(key, model[:-1])
+        else:
+            key = None
+        prep_keys.append(key)
+
+    with ThreadPoolExecutor(max_workers=max(len(models), 1)) as pool:
+        keys = list(preprocessors)
+        matrices = dict(zip(keys, pool.map(lambda k: preprocessors[k].transform(X), keys)))
+        matrices[None] = X
+
+        def _predict(i):
+            estimator = models[i][-1] if prep_keys[i] is not None else models[i]
+            return estimator.predict_proba(matrices[prep_keys[i]])[:, 1]
+
+        probas = list(pool.map(_predict, range(len(models))))
+
+    return np.vstack(probas) if probas else np.empty((0, len(X)))
+
+
+def score_candidates_on_test(candidates: list, test_df, threshold=0.5, return_proba=False):
+    """
+    Load all candidate models concurrently and score them on the test set.
+
+    Args:
+        candidates (list[dict]): candidates as returned by
+            get_candidates_for_current_run() (need 'name', 'version', 'model_uri').
+        test_df (pd.DataFrame): test set including the CreditRisk label.
+        threshold (float): decision threshold for classification metrics.
+        return_proba (bool): also return the test-set probabilities
+            (e.g. for bootstrap_metrics()).
+
+    Returns:
+        pd.DataFrame: one row per candidate with identification columns
+        followed by the score_on_test metric set. When return_proba is True,
+        a tuple (table, y_proba) with y_proba of shape (n_candidates, n_samples).
+    """
+    X_test = test_df.drop(columns=["CreditRisk"])
+    y_test = test_df["CreditRisk"].to_numpy()
+
+    uris = [c["model_uri"] for c in candidates]
+    with span("model_load", models=len(uris)), ThreadPoolExecutor(max_workers=max(len(uris), 1)) as pool:
+        models = list(pool.map(mlflow.sklearn.load_model, uris))
+
+    with span("predict", rows=len(X_test), models=len(models)):
+        y_proba = predict_candidates_proba(models, X_test)
+    with span("metrics"):
+        metrics = binary_classification_metrics(y_test, y_proba, threshold=threshold)
+
+    table = pd.DataFrame({
+        "name": [c["name"] for c in candidates],
+        "version": [c["version"] for c in candidates],
+        "model_uri": uris,
+    })
+    for metric, values in metrics.items():
+        table[metric] = values
+
+    if return_proba:
+        return table, y_proba
+    return table
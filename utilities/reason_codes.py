@@ -0,0 +1,171 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+from xgboost import DMatrix
+
+
+def _dense(X) -> np.ndarray:
+    return X.toarray() if sp.issparse(X) else np.asarray(X, dtype=float)
+
+
+def transformed_feature_owners(preprocessor) -> list:
+    """
+    Map each output column of a fitted build_preprocessor() ColumnTransformer
+    back to the original input column it was derived from.
+
+    One-hot encoded columns map to their source column (one entry per
+    category); numeric and target-encoded columns map one-to-one.
+
+    Returns:
+        list[str] of length n_transformed_features.
+    """
+    owners = [None] * sum(s.stop - s.start for s in preprocessor.output_indices_.values())
+
+    for name, transformer, columns in preprocessor.transformers_:
+        if name == "remainder" and transformer == "drop":
+            continue
+        out = preprocessor.output_indices_[name]
+        if out.stop == out.start:
+            continue
+
+        last = transformer[-1] if isinstance(transformer, Pipeline) else transformer
+        if isinstance(last, OneHotEncoder):
+            widths = [len(cats) for cats in last.categories_]
+        else:
+            widths = [1] * len(columns)
+        if sum(widths) != out.stop - out.start:
+            raise ValueError(f"Cannot map output columns of transformer '{name}' back to its inputs")
+
+        position = out.start
+        for column, width in zip(columns, widths):
+            owners[position:position + width] = [column] * width
+            position += width
+
+    return owners
+
+
+class ReasonCodeEngine:
+    """
+    Per-applicant feature contributions and top-k reason codes for a fitted
+    build_pipelines() Pipeline.
+
+    Contributions are computed on the model input and summed back onto the
+    original columns (feature_groups.yaml names), in the model's natural
+    output space:
+        - LogisticRegression: exact closed form coef * (x - reference mean), in log-odds.
+        - XGBClassifier: exact path-dependent TreeSHAP via xgboost's pred_contribs, in log-odds.
+        - RandomForest/ExtraTrees: path-dependent (Saabas) decomposition, in probability,
+          computed for the whole batch with one sparse product of the forest's
+          decision paths and a precomputed node-delta matrix.
+
+    Positive contributions push towards default (class 1).
+
+    Args:
+        pipeline: fitted sklearn Pipeline (preprocessor + estimator).
+        background (pd.DataFrame, optional): reference rows (e.g. the training
+            split); required for LogisticRegression to define the baseline.
+    """
+
+    def __init__(self, pipeline: Pipeline, background: pd.DataFrame = None):
+        self.preprocessor = pipeline[:-1]
+        self.model = pipeline[-1]
+        column_transformer = pipeline[0]
+        owners = transformed_feature_owners(column_transformer)
+
+        self.feature_names = list(dict.fromkeys(owners))
+        # (n_transformed x n_original) 0/1 matrix that sums encoded columns per source column
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        self._group = sp.csr_matrix(
+            (np.ones(len(owners)), (np.arange(len(owners)), [index[o] for o in owners])),
+            shape=(len(owners), len(self.feature_names))
+        )
+
+        if isinstance(self.model, LogisticRegression):
+            if background is None:
+                raise ValueError("LogisticRegression reason codes need background rows for the baseline")
+            self._reference = _dense(self.preprocessor.transform(background)).mean(axis=0)
+            self._method = "linear"
+        elif hasattr(self.model, "get_booster"):
+            self._method = "xgb"
+        elif hasattr(self.model, "estimators_") and all(hasattr(e, "tree_") for e in self.model.estimators_):
+            self._node_deltas = self._forest_node_deltas(self.model, len(owners))
+            self._method = "forest"
+        else:
+            raise ValueError(f"Unsupported model type for reason codes: {type(self.model).__name__}")
+
+    @staticmethod
+    def _forest_node_deltas(forest, n_features: int):
+        """
+        Sparse (total_nodes x n_features) matrix: entering a node from its parent
+        adds value(node) - value(parent) to the parent's split feature.
+        """
+        rows, cols, vals = [], [], []
+        offset = 0
+        for est in forest.estimators_:
+            t = est.tree_
+            counts = t.value[:, 0, :]
+            value = counts[:, 1] / counts.sum(axis=1)
+
+            internal = np.flatnonzero(t.children_left >= 0)
+            for children in (t.children_left[internal], t.children_right[internal]):
+                rows.append(children + offset)
+                cols.append(t.feature[internal])
+                vals.append(value[children] - value[internal])
+            offset += t.node_count
+
+        return sp.csr_matrix(
+            (np.concatenate(vals) / len(forest.estimators_), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(offset, n_features)
+        )
+
+    def _model_contributions(self, Xt) -> np.ndarray:
+        if self._method == "linear":
+            return (_dense(Xt) - self._reference) * self.model.coef_[0]
+        if self._method == "xgb":
+            contribs = self.model.get_booster().predict(DMatrix(Xt), pred_contribs=True)
+            return contribs[:, :-1]  # last column is the bias term
+        paths, _ = self.model.decision_path(Xt)
+        return np.asarray((paths @ self._node_deltas).todense())
+
+    def contributions(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        Contribution of each original feature for every row of X.
+
+        Returns:
+            pd.DataFrame of shape (n_samples, n_original_features), indexed like X.
+        """
+        Xt = self.preprocessor.transform(X)
+        grouped = self._group.T @ self._model_contributions(Xt).T
+        return pd.DataFrame(np.asarray(grouped).T, columns=self.feature_names, index=X.index)
+
+    def top_reasons(self, X: pd.DataFrame, k: int = 4) -> pd.DataFrame:
+        """
+        Top-k features pushing each applicant towards default.
+
+        Only positive contributions qualify; unused slots are None/NaN.
+
+        Returns:
+            pd.DataFrame with columns reason_1..reason_k and contribution_1..contribution_k.
+        """
+        contrib = self.contributions(X).to_numpy()
+        k = min(k, contrib.shape[1])
+        # argpartition keeps this linear in the number of features per row
+        top = np.argpartition(-contrib, k - 1, axis=1)[:, :k]
+        top_vals = np.take_along_axis(contrib, top, axis=1)
+        order = np.argsort(-top_vals, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_vals = np.take_along_axis(top_vals, order, axis=1)
+
+        names = np.asarray(self.feature_names, dtype=object)[top]
+        names[top_vals <= 0] = None
+        top_vals = np.where(top_vals > 0, top_vals, np.nan)
+
+        out = {}
+        for i in range(k):
+            out[f"reason_{i + 1}"] = names[:, i]
+        for i in range(k):
+            out[f"contribution_{i + 1}"] = top_vals[:, i]
+        return pd.DataFrame(out, index=X.index)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+FEATURE_GROUP_KEYS = ("num_cols", "simple_cat_cols", "complex_cat_cols", "passthrough_cols")
+
+
+def feature_group_columns(feature_groups: dict) -> list:
+    """
+    Flatten feature_groups.yaml into the ordered list of model input columns.
+    """
+    columns = []
+    for key in FEATURE_GROUP_KEYS:
+        columns.extend(c for c in feature_groups.get(key) or [] if c not in columns)
+    return columns
+
+
+def _canonical_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = float(value)
+        # 6, 6.0 and np.int64(6) hash the same; all missing values collapse to None
+        return None if math.isnan(value) else value
+    return str(value)
+
+
+def record_key(record: dict, columns: list, model_uri: str) -> str:
+    """
+    Canonical hash of one application's feature values plus the model URI.
+
+    Only the feature-group columns take part (in a fixed order), so extra
+    fields such as request ids or timestamps do not defeat the cache.
+    """
+    payload = [model_uri, [_canonical_value(record.get(c)) for c in columns]]
+    encoded = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class ScoreCache:
+    """
+    TTL + size-bounded LRU cache of scores keyed by record_key().
+
+    Args:
+        columns (list[str]): feature columns that define an application
+            (see feature_group_columns()).
+        max_entries (int): LRU capacity; least recently used entries are evicted.
+        ttl_seconds (float): entry lifetime.
+
+    Entries are keyed by model URI, so scores of a replaced champion are never
+    served for its successor; the owner calls invalidate() after reloading a
+    model to free them early.
+    """
+
+    def __init__(self, columns: list, max_entries: int = 100_000, ttl_seconds: float = 900.0):
+        self.columns = list(columns)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self):
+        """
+        Drop every entry after the model behind the cache changed.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def get(self, record: dict, model_uri: str):
+        """
+        Return the cached score for record under model_uri, or None on a miss.
+        """
+        now = time.monotonic()
+        key = record_key(record, self.columns, model_uri)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, record: dict, model_uri: str, score: float):
+        key = record_key(record, self.columns, model_uri)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, score)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        # Snapshot under the lock so size and counters agree with each other
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,237 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def fit_synthetic_profile(
+    df: pd.DataFrame,
+    target_col: str = "CreditRisk",
+    n_quantiles: int = 101,
+    smoothing: float = 0.5
+) -> dict:
+    """
+    Fit per-column marginals conditional on the target from a curated dataset.
+
+    For each target class the profile stores, per column, the category
+    frequencies (categorical columns) or an empirical quantile function
+    (numeric columns) plus the missing rate. Generated rows draw the target
+    from its prior and every feature from its class-conditional marginal,
+    so the target signal of each feature is preserved while no real row is
+    ever reproduced.
+
+    Args:
+        df (pd.DataFrame): curated dataset (e.g. the output of curate_german_data.py).
+        target_col (str): binary target column.
+        n_quantiles (int): points of the numeric quantile functions.
+        smoothing (float): pseudo-count added to every category in every
+            class, so rare categories can appear in both classes.
+
+    Returns:
+        dict: JSON-serialisable profile consumed by generate_synthetic_frame().
+    """
+    classes = sorted(df[target_col].dropna().unique().tolist())
+    columns = [c for c in df.columns if c != target_col]
+    levels = np.linspace(0, 1, n_quantiles)
+
+    specs = {}
+    for col in columns:
+        values = df[col]
+        if pd.api.types.is_numeric_dtype(values):
+            finite = values.dropna()
+            specs[col] = {
+                "type": "numeric",
+                "integer": bool(len(finite) and np.all(np.mod(finite, 1) == 0)),
+                "has_missing": bool(values.isna().any()),
+            }
+        else:
+            specs[col] = {
+                "type": "categorical",
+                "categories": sorted(values.dropna().astype(str).unique().tolist()),
+                "has_missing": bool(values.isna().any()),
+            }
+
+    conditionals = {}
+    for cls in classes:
+        subset = df[df[target_col] == cls]
+        per_column = {}
+        for col, spec in specs.items():
+            values = subset[col]
+            missing_rate = float(values.isna().mean()) if len(values) else 0.0
+            if spec["type"] == "numeric":
+                finite = values.dropna().to_numpy(dtype=float)
+                if not finite.size:
+                    finite = df[col].dropna().to_numpy(dtype=float)
+                per_column[col] = {"quantiles": np.quantile(finite, levels).tolist(), "missing_rate": missing_rate}
+            else:
+                counts = values.dropna().astype(str).value_counts().reindex(spec["categories"], fill_value=0)
+                probs = (counts.to_numpy(dtype=float) + smoothing)
+                per_column[col] = {"probs": (probs / probs.sum()).tolist(), "missing_rate": missing_rate}
+        conditionals[str(cls)] = per_column
+
+    return {
+        "target_col": target_col,
+        "columns": list(df.columns),
+        "classes": classes,
+        "class_probs": [float((df[target_col] == cls).mean()) for cls in classes],
+        "specs": specs,
+        "conditionals": conditionals,
+    }
+
+
+def save_profile(profile: dict, path: str):
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+
+
+def load_profile(path: str) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def generate_synthetic_frame(profile: dict, n_rows: int, seed) -> pd.DataFrame:
+    """
+    Draw n_rows synthetic rows from a fitted profile.
+
+    Args:
+        profile (dict): output of fit_synthetic_profile().
+        n_rows (int): number of rows.
+        seed (int | np.random.SeedSequence): seed of this chunk's stream.
+
+    Returns:
+        pd.DataFrame with the profile's columns, in the original order.
+    """
+    rng = np.random.default_rng(seed)
+    classes = profile["classes"]
+    labels = rng.choice(len(classes), size=n_rows, p=_normalised(profile["class_probs"]))
+
+    data = {}
+    for col, spec in profile["specs"].items():
+        numeric = spec["type"] == "numeric"
+        if numeric:
+            out = np.empty(n_rows, dtype=float)
+        else:
+            out = np.empty(n_rows, dtype=object)
+            categories = np.asarray(spec["categories"], dtype=object)
+
+        for k, cls in enumerate(classes):
+            rows = np.flatnonzero(labels == k)
+            if not rows.size:
+                continue
+            cond = profile["conditionals"][str(cls)][col]
+            if numeric:
+                # Inverse-CDF sampling through the empirical quantile function
+                quantiles = np.asarray(cond["quantiles"])
+                draws = np.interp(rng.random(rows.size), np.linspace(0, 1, len(quantiles)), quantiles)
+                out[rows] = np.round(draws) if spec["integer"] else draws
+            else:
+                out[rows] = categories[rng.choice(len(categories), size=rows.size, p=_normalised(cond["probs"]))]
+
+            if cond["missing_rate"] > 0:
+                out[rows[rng.random(rows.size) < cond["missing_rate"]]] = np.nan if numeric else None
+
+        # Fixed dtypes per column so every chunk shares one schema
+        if numeric and spec["integer"] and not spec["has_missing"]:
+            out = out.astype(np.int64)
+        data[col] = out
+
+    target_values = np.asarray(classes)[labels]
+    data[profile["target_col"]] = target_values.astype(np.int64) \
+        if np.issubdtype(target_values.dtype, np.integer) else target_values
+    return pd.DataFrame(data)[profile["columns"]]
+
+
+def _normalised(probs: list) -> np.ndarray:
+    # Profiles are JSON; rounded (or hand-edited) probabilities need not sum to exactly 1
+    probs = np.asarray(probs, dtype=float)
+    return probs / probs.sum()
+
+
+def _generate_chunk(args):
+    profile, n_rows, seed, file_format, header = args
+    chunk = generate_synthetic_frame(profile, n_rows, seed)
+    # CSV text is rendered in the worker so formatting also runs in parallel
+    return chunk.to_csv(header=header, index=False) if file_format == "csv" else chunk
+
+
+def generate_synthetic_data(
+    profile: dict,
+    n_rows: int,
+    output_path: str,
+    chunk_size: int = 250_000,
+    n_workers: int = None,
+    random_state: int = 0,
+    file_format: str = None
+) -> int:
+    """
+    Generate arbitrarily many synthetic rows in parallel and stream them to disk.
+
+    The rows are split into fixed-size chunks, each drawn from its own
+    independent stream spawned from np.random.SeedSequence(random_state), so
+    the output is identical for any n_workers. Chunks are produced by a
+    process pool with at most 2 * n_workers in flight and written in order
+    as soon as they complete, keeping memory bounded.
+
+    Args:
+        profile (dict): output of fit_synthetic_profile().
+        n_rows (int): total rows to generate.
+        output_path (str): destination .csv or .parquet file.
+        chunk_size (int): rows per chunk (and per seeded stream).
+        n_workers (int, optional): worker processes; defaults to the CPU count.
+        random_state (int): root seed.
+        file_format (str, optional): "csv" or "parquet"; inferred from the
+            output_path extension when omitted. Parquet needs pyarrow.
+
+    Returns:
+        int: number of rows written.
+    """
+    file_format = file_format or ("parquet" if output_path.endswith(".parquet") else "csv")
+    if file_format not in ("csv", "parquet"):
+        raise ValueError(f"Unsupported file_format: {file_format}")
+    n_workers = n_workers or os.cpu_count() or 1
+
+    n_chunks = max(1, -(-n_rows // chunk_size))
+    seeds = np.random.SeedSequence(random_state).spawn(n_chunks)
+    sizes = [min(chunk_size, n_rows - i * chunk_size) for i in range(n_chunks)]
+
+    writer = None
+    written = 0
+
+    def _write(chunk, n_chunk_rows: int):
+        nonlocal writer, written
+        if file_format == "csv":
+            writer.write(chunk)
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Parquet output requires pyarrow (pip install pyarrow); use a .csv output instead") from e
+
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, pa.Schema.from_pandas(chunk, preserve_index=False))
+            writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+        written += n_chunk_rows
+
+    in_flight = deque()
+    if file_format == "csv":
+        writer = open(output_path, "w", newline="")
+    try:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for i, (size, seed) in enumerate(zip(sizes, seeds)):
+                future = pool.submit(_generate_chunk, (profile, size, seed, file_format, i == 0))
+                in_flight.append((future, size))
+                while len(in_flight) >= 2 * n_workers:
+                    future, size = in_flight.popleft()
+                    _write(future.result(), size)
+            while in_flight:
+                future, size = in_flight.popleft()
+                _write(future.result(), size)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return written
@@ -0,0 +1,164 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, OneToOneFeatureMixin, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+class OutOfFoldTargetEncoder(OneToOneFeatureMixin, TransformerMixin, BaseEstimator):
+    """
+    Replace each category by the smoothed mean of the target within it.
+
+    Every column is factorized to integer codes once; per-category target sums
+    and counts then come from np.bincount, and transform() is a single gather
+    from the encoding table. Categories are blended with the global mean as
+    (sum + smoothing * prior) / (count + smoothing), so rare categories shrink
+    towards the prior. Unseen and missing categories encode to the prior.
+
+    This is a plain m-estimate, not the category_encoders TargetEncoder it
+    replaces (smoothing=1.0, min_samples_leaf=20, sigmoid weighting): the
+    default smoothing=20 shrinks a category seen n times by 20 / (n + 20),
+    so encodings of mid-sized categories sit closer to the prior than before.
+
+    fit_transform() (what Pipeline.fit calls) returns out-of-fold encodings:
+    each training row is encoded with statistics from the other cv folds, so
+    its own target never leaks into its feature. transform() uses statistics
+    fitted on all rows, as at scoring time. With fewer rows than cv folds
+    fit_transform() falls back to these in-sample encodings, which leak the
+    target, and emits a UserWarning.
+
+    Args:
+        smoothing (float): pseudo-count of the prior in every category.
+        cv (int): folds for the out-of-fold fit_transform(); 0 or 1 disables it
+            (in-sample encodings, no warning).
+        shuffle (bool): assign rows to folds at random rather than in order.
+        random_state (int, optional): seed of the fold assignment.
+    """
+
+    def __init__(self, smoothing: float = 20.0, cv: int = 5, shuffle: bool = True, random_state: int = 0):
+        self.smoothing = smoothing
+        self.cv = cv
+        self.shuffle = shuffle
+        self.random_state = random_state
+
+    def _factorize(self, X, fit: bool) -> np.ndarray:
+        """
+        Integer codes per column, shape (n_samples, n_features); -1 marks
+        missing values (and, outside fit, unseen categories).
+        """
+        if hasattr(X, "iloc"):
+            columns = [X.iloc[:, j] for j in range(X.shape[1])]
+        else:
+            X = np.asarray(X)
+            if X.ndim == 1:
+                X = X.reshape(-1, 1)
+            columns = [X[:, j] for j in range(X.shape[1])]
+
+        if fit:
+            self.n_features_in_ = len(columns)
+            if hasattr(X, "columns"):
+                self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            elif hasattr(self, "feature_names_in_"):
+                del self.feature_names_in_
+            self.categories_ = []
+        elif len(columns) != self.n_features_in_:
+            raise ValueError(f"X has {len(columns)} features, but the encoder was fitted with {self.n_features_in_}")
+
+        codes = np.empty((len(columns[0]) if columns else 0, len(columns)), dtype=np.intp)
+        for j, column in enumerate(columns):
+            if fit:
+                codes[:, j], uniques = pd.factorize(column, sort=True)
+                self.categories_.append(pd.Index(uniques))
+            else:
+                codes[:, j] = self.categories_[j].get_indexer(column)
+        return codes
+
+    def _encodings(self, codes: np.ndarray, y: np.ndarray, n_categories: int) -> np.ndarray:
+        """
+        Smoothed mean per category, with the prior appended at index -1
+        (so the -1 codes of missing and unseen values gather the prior).
+        """
+        seen = codes >= 0
+        sums = np.bincount(codes[seen], weights=y[seen], minlength=n_categories)
+        counts = np.bincount(codes[seen], minlength=n_categories)
+        return np.append((sums + self.smoothing * self.prior_) / (counts + self.smoothing), self.prior_)
+
+    def fit(self, X, y):
+        """
+        Learn the per-category encodings on all rows.
+        """
+        self._fit(X, y)
+        return self
+
+    def _fit(self, X, y) -> tuple[np.ndarray, np.ndarray]:
+        y = np.asarray(y, dtype=float)
+        codes = self._factorize(X, fit=True)
+        if len(y) != len(codes):
+            raise ValueError(f"X has {len(codes)} rows but y has {len(y)}")
+        self.prior_ = float(y.mean())
+        self.encodings_ = [
+            self._encodings(codes[:, j], y, len(cats)) for j, cats in enumerate(self.categories_)
+        ]
+        return codes, y
+
+    def transform(self, X) -> np.ndarray:
+        """
+        Encode X with the statistics fitted on all training rows.
+
+        Returns:
+            np.ndarray[float64] of shape (n_samples, n_features).
+        """
+        check_is_fitted(self, "encodings_")
+        codes = self._factorize(X, fit=False)
+        out = np.empty(codes.shape, dtype=float)
+        for j, encodings in enumerate(self.encodings_):
+            out[:, j] = encodings[codes[:, j]]
+        return out
+
+    def fit_transform(self, X, y=None, **fit_params) -> np.ndarray:
+        """
+        Fit on all rows and return out-of-fold encodings of the training rows.
+
+        For each fold, per-category sums and counts of the other folds are the
+        totals minus the fold's own (one bincount over fold x category ids),
+        so the cost stays linear in rows whatever the number of folds.
+        """
+        if y is None:
+            raise ValueError("OutOfFoldTargetEncoder requires y")
+        codes, y = self._fit(X, y)
+        n = len(y)
+        if not self.cv or self.cv < 2:
+            return self.transform(X)
+        if n < self.cv:
+            warnings.warn(
+                f"OutOfFoldTargetEncoder got {n} rows for cv={self.cv}; "
+                "falling back to in-sample encodings, which leak the target",
+                UserWarning
+            )
+            return self.transform(X)
+
+        rng = np.random.default_rng(self.random_state)
+        order = rng.permutation(n) if self.shuffle else np.arange(n)
+        folds = np.empty(n, dtype=np.intp)
+        folds[order] = np.arange(n) * self.cv // n
+
+        fold_n = np.bincount(folds, minlength=self.cv)
+        prior = (y.sum() - np.bincount(folds, weights=y, minlength=self.cv)) / (n - fold_n)
+
+        out = np.empty(codes.shape, dtype=float)
+        for j, cats in enumerate(self.categories_):
+            k = len(cats)
+            col = codes[:, j]
+            seen = col >= 0
+            # Statistics of each (fold, category) pair, then of everything outside the fold
+            ids = folds[seen] * k + col[seen]
+            fold_sums = np.bincount(ids, weights=y[seen], minlength=self.cv * k).reshape(self.cv, k)
+            fold_counts = np.bincount(ids, minlength=self.cv * k).reshape(self.cv, k)
+            oof_sums = fold_sums.sum(axis=0) - fold_sums
+            oof_counts = fold_counts.sum(axis=0) - fold_counts
+
+            encodings = (oof_sums + self.smoothing * prior[:, None]) / (oof_counts + self.smoothing)
+            # Missing values take their fold's out-of-fold prior
+            out[:, j] = np.where(seen, encodings[folds, np.maximum(col, 0)], prior[folds])
+        return out
@@ -0,0 +1,238 @@
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+
+ARRAY_FIELDS = ("feature", "threshold", "left", "right", "default_left", "value", "roots")
+
+
+@dataclass
+class TreeEnsemble:
+    """
+    Flat struct-of-arrays representation of a fitted binary tree ensemble.
+
+    All trees are concatenated into one set of node arrays; child indices are
+    global. Leaves point to themselves, so every sample can be walked for
+    exactly max_depth steps without per-sample branching.
+
+    Attributes:
+        feature (np.ndarray[int32]): split feature per node (0 for leaves).
+        threshold (np.ndarray[float64]): split threshold per node.
+        left, right (np.ndarray[int32]): global child index per node.
+        default_left (np.ndarray[bool]): direction for missing values.
+        value (np.ndarray[float64]): leaf output (class-1 probability for
+            forests, margin contribution for boosted trees).
+        roots (np.ndarray[int32]): root node index of each tree.
+        max_depth (int): depth of the deepest tree.
+        decision (str): "le" (go left if x <= threshold, sklearn) or
+            "lt" (go left if x < threshold, xgboost).
+        aggregation (str): "mean_proba" (forest average) or "logit_sum"
+            (sum of margins + base_margin, then sigmoid).
+        base_margin (float): margin offset for "logit_sum".
+    """
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    default_left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    max_depth: int
+    decision: str
+    aggregation: str
+    base_margin: float = 0.0
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def predict_proba(self, X, batch_size: int = 4096) -> np.ndarray:
+        """
+        Predict class probabilities for a batch of already-preprocessed rows.
+
+        Args:
+            X (array-like or sparse matrix): model input, shape (n_samples, n_features),
+                i.e. the output of the pipeline's preprocessor.
+            batch_size (int): rows walked at once; bounds the (rows x trees) work arrays.
+
+        Returns:
+            np.ndarray of shape (n_samples, 2), like sklearn's predict_proba.
+        """
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        # Both sklearn and xgboost compare float32 inputs against their thresholds
+        X = np.asarray(X, dtype=np.float32)
+
+        proba = np.empty(X.shape[0])
+        for start in range(0, X.shape[0], batch_size):
+            proba[start:start + batch_size] = self._predict_batch(X[start:start + batch_size])
+        return np.column_stack([1.0 - proba, proba])
+
+    def _predict_batch(self, X: np.ndarray) -> np.ndarray:
+        rows = np.arange(X.shape[0])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[nodes]].astype(np.float64)
+            thr = self.threshold[nodes]
+            go_left = x <= thr if self.decision == "le" else x < thr
+            missing = np.isnan(x)
+            if missing.any():
+                go_left = np.where(missing, self.default_left[nodes], go_left)
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+        leaf_values = self.value[nodes]
+        if self.aggregation == "mean_proba":
+            return leaf_values.mean(axis=1)
+        return 1.0 / (1.0 + np.exp(-(leaf_values.sum(axis=1) + self.base_margin)))
+
+    def save(self, path: str):
+        """
+        Save as a directory of raw .npy arrays plus a meta.json, so that
+        load() can memory-map the node arrays instead of parsing them.
+        """
+        os.makedirs(path, exist_ok=True)
+        for field in ARRAY_FIELDS:
+            np.save(os.path.join(path, f"{field}.npy"), getattr(self, field))
+        meta = {
+            "max_depth": self.max_depth,
+            "decision": self.decision,
+            "aggregation": self.aggregation,
+            "base_margin": self.base_margin,
+        }
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "TreeEnsemble":
+        """
+        Load an ensemble written by save(); arrays are memory-mapped by default.
+        """
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            meta = json.load(f)
+        mmap_mode = "r" if mmap else None
+        arrays = {
+            field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode=mmap_mode)
+            for field in ARRAY_FIELDS
+        }
+        return cls(**arrays, **meta)
+
+
+def _concat_trees(trees: list, **kwargs) -> TreeEnsemble:
+    """
+    Concatenate per-tree node arrays into a TreeEnsemble with global indices.
+
+    Each tree is a dict with local arrays: feature, threshold, left, right
+    (-1 for leaves), default_left, value, plus its depth.
+    """
+    offsets = np.cumsum([0] + [len(t["left"]) for t in trees])
+    parts = {f: [] for f in ("feature", "threshold", "left", "right", "default_left", "value")}
+
+    for tree, offset in zip(trees, offsets):
+        is_leaf = tree["left"] < 0
+        own = np.arange(len(is_leaf)) + offset
+        parts["left"].append(np.where(is_leaf, own, tree["left"] + offset))
+        parts["right"].append(np.where(is_leaf, own, tree["right"] + offset))
+        parts["feature"].append(np.where(is_leaf, 0, tree["feature"]))
+        parts["threshold"].append(tree["threshold"])
+        parts["default_left"].append(tree["default_left"])
+        parts["value"].append(tree["value"])
+
+    return TreeEnsemble(
+        feature=np.concatenate(parts["feature"]).astype(np.int32),
+        threshold=np.concatenate(parts["threshold"]).astype(np.float64),
+        left=np.concatenate(parts["left"]).astype(np.int32),
+        right=np.concatenate(parts["right"]).astype(np.int32),
+        default_left=np.concatenate(parts["default_left"]).astype(bool),
+        value=np.concatenate(parts["value"]).astype(np.float64),
+        roots=offsets[:-1].astype(np.int32),
+        max_depth=int(max(t["depth"] for t in trees)),
+        **kwargs
+    )
+
+
+def _export_sklearn_forest(model) -> TreeEnsemble:
+    trees = []
+    for est in model.estimators_:
+        t = est.tree_
+        counts = t.value[:, 0, :]
+        value = counts[:, 1] / counts.sum(axis=1)
+        missing_left = getattr(t, "missing_go_to_left", np.zeros(t.node_count, dtype=bool))
+        trees.append({
+            "feature": t.feature,
+            "threshold": t.threshold,
+            "left": t.children_left,
+            "right": t.children_right,
+            "default_left": np.asarray(missing_left, dtype=bool),
+            "value": value,
+            "depth": t.max_depth,
+        })
+    return _concat_trees(trees, decision="le", aggregation="mean_proba")
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = np.zeros(len(left), dtype=int)
+    # xgboost stores parents before children, so one forward pass suffices
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+def _export_xgboost(model) -> TreeEnsemble:
+    learner = json.loads(model.get_booster().save_raw("json"))["learner"]
+
+    objective = learner["objective"]["name"]
+    if objective != "binary:logistic":
+        raise ValueError(f"Unsupported xgboost objective for export: {objective}")
+
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+    base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+    trees = []
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError("Categorical xgboost splits are not supported for export")
+        left = np.asarray(tree["left_children"])
+        right = np.asarray(tree["right_children"])
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        trees.append({
+            "feature": np.asarray(tree["split_indices"]),
+            "threshold": conditions,
+            "left": left,
+            "right": right,
+            "default_left": np.asarray(tree["default_left"], dtype=bool),
+            # Leaves keep their output in split_conditions
+            "value": np.where(left < 0, conditions, 0.0),
+            "depth": _tree_depth(left, right),
+        })
+    return _concat_trees(trees, decision="lt", aggregation="logit_sum", base_margin=base_margin)
+
+
+def export_tree_ensemble(model) -> TreeEnsemble:
+    """
+    Convert a fitted tree ensemble (or a Pipeline ending in one) into a TreeEnsemble.
+
+    Supports sklearn forests (RandomForestClassifier, ExtraTreesClassifier)
+    and XGBClassifier with the binary:logistic objective. For a Pipeline,
+    only the final estimator is exported; inputs to predict_proba must
+    already be transformed by pipeline[:-1].
+
+    Example:
+        compact = export_tree_ensemble(pipeline)
+        proba = compact.predict_proba(pipeline[:-1].transform(X))
+    """
+    if isinstance(model, Pipeline):
+        model = model[-1]
+
+    if hasattr(model, "get_booster"):
+        return _export_xgboost(model)
+    if hasattr(model, "estimators_") and all(hasattr(e, "tree_") for e in model.estimators_):
+        if len(model.classes_) != 2:
+            raise ValueError("Only binary classifiers can be exported")
+        return _export_sklearn_forest(model)
+
+    raise ValueError(f"Unsupported model type for tree export: {type(model).__name__}")